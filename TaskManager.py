@@ -1,17 +1,795 @@
-import sys
-import os
-import csv
 import datetime
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+# Taken before the Qt imports so --startup-time covers the whole cold start
+_START_TIME = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QTextEdit, QPushButton, QCheckBox, QScrollArea,
-    QFrame, QMessageBox
+    QFrame, QMessageBox, QListView, QDialog, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QProgressDialog, QStackedWidget,
+    QSizePolicy
+)
+from PyQt6.QtCore import (
+    Qt, QDate, QTimer, QAbstractListModel, QModelIndex, QObject, QRunnable,
+    QThreadPool, pyqtSignal, QBuffer, QEvent, QIODevice, QSize, QFileSystemWatcher
+)
+from PyQt6.QtGui import QPixmap
+
+from taskcore import open_storage
+from taskcore.analytics import Analytics
+from taskcore.downsample import lttb
+from taskcore.export import export_data
+from taskcore.formats import format_daily_log, format_weekly_review
+from taskcore.image_cache import ImageCache, fingerprint
+from taskcore.instrumentation import PROFILER, instrumented
+from taskcore.persistence import install_flush_handlers
+from taskcore.search_index import SearchIndex, append_update
+from taskcore.task_import import merge_tasks, parse_task_text, read_task_file
+from taskcore.tasks import (
+    DEFAULT_TASKS, WEEKLY_TASKS, initialize_defaults, read_day_tasks, rebase_edits,
+    review_week_id, save_day_tasks, save_weekly_progress, validate_log_date,
 )
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QFont
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+
+
+class Worker(QRunnable):
+    """Run a function on the global thread pool and signal its result"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+def run_in_background(fn, *args, on_done=None, on_error=None, on_progress=None):
+    """Start ``fn(*args)`` on a pool thread; callbacks run on the UI thread.
+
+    With ``on_progress``, ``fn`` also gets a ``progress(done, total)`` keyword
+    argument whose calls are delivered to ``on_progress``.
+    """
+    worker = Worker(fn, *args)
+    if on_done is not None:
+        worker.signals.finished.connect(on_done)
+    if on_error is not None:
+        worker.signals.failed.connect(on_error)
+    if on_progress is not None:
+        worker.signals.progress.connect(on_progress)
+        worker.kwargs["progress"] = worker.signals.progress.emit
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class BackgroundLoader:
+    """Read data on a pool thread and apply it on the UI thread.
+
+    ``read`` must only touch storage and return plain data; ``apply`` puts
+    it into widgets. Only the newest load's result is applied, so a slow
+    read cannot overwrite a later one. ``busy_widget`` is disabled while a
+    load is in flight so edits cannot race the incoming data.
+    """
+
+    def __init__(self, read, apply, on_error=None, busy_widget=None):
+        self.read = read
+        self.apply = apply
+        self.on_error = on_error
+        self.busy_widget = busy_widget
+        self.generation = 0
+        self.loading = False
+
+    def load(self, *args):
+        self.generation += 1
+        generation = self.generation
+        self.loading = True
+        if self.busy_widget is not None:
+            self.busy_widget.setEnabled(False)
+        run_in_background(
+            self.read, *args,
+            on_done=lambda result: self._finish(generation, result),
+            on_error=lambda message: self._fail(generation, message),
+        )
+
+    def _settle(self, generation):
+        if generation != self.generation:
+            return False
+        self.loading = False
+        if self.busy_widget is not None:
+            self.busy_widget.setEnabled(True)
+        return True
+
+    def _finish(self, generation, result):
+        if self._settle(generation):
+            self.apply(result)
+
+    def _fail(self, generation, message):
+        if self._settle(generation) and self.on_error is not None:
+            self.on_error(message)
+
+
+def replace_rows(model, old, new, store):
+    """Turn a list model's rows from ``old`` into ``new`` with minimal signals.
+
+    Rows in the common prefix and suffix are left alone, changed rows in
+    between are rebound in place with one dataChanged, and only the
+    difference in length is inserted or removed. Views keep their selection,
+    scroll position and open editors. ``store(rows)`` must make the model's
+    data equal ``rows``.
+    """
+    start = 0
+    end = min(len(old), len(new))
+    while start < end and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    rebound = min(old_end, new_end)
+    if rebound > start:
+        store(new[:rebound] + old[rebound:])
+        model.dataChanged.emit(model.index(start), model.index(rebound - 1))
+    if old_end > rebound:
+        model.beginRemoveRows(QModelIndex(), rebound, old_end - 1)
+        store(new)
+        model.endRemoveRows()
+    elif new_end > rebound:
+        model.beginInsertRows(QModelIndex(), rebound, new_end - 1)
+        store(new)
+        model.endInsertRows()
+
+
+class HistoryListModel(QAbstractListModel):
+    """Newest-first history entries, revealed a page at a time.
+
+    Only the entry keys are held up front. Rows are exposed through
+    canFetchMore/fetchMore as the view scrolls, and an entry's text is read
+    on a pool thread the first time the view asks for it.
+    """
+
+    PAGE_SIZE = 20
+
+    def __init__(self, read_entry, parent=None):
+        super().__init__(parent)
+        self.read_entry = read_entry
+        self._keys = []  # newest first
+        self._shown = 0
+        self._contents = {}
+        self._requested = set()
+        self._load_scheduled = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._shown
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._shown < len(self._keys)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._keys) - self._shown)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._shown, self._shown + count - 1)
+        self._shown += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        key = self._keys[index.row()]
+        content = self._contents.get(key)
+        if content is None:
+            self._request(key)
+            return f"{key}\nLoading..."
+        return content
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def set_keys(self, keys):
+        """Replace the entry list; cached texts of kept entries survive.
+
+        Pages already fetched stay fetched, and only rows whose key changed
+        are touched.
+        """
+        keys = list(keys)
+        shown = min(max(self._shown, self.PAGE_SIZE), len(keys))
+        tail = keys[shown:]
+
+        def store(rows):
+            self._keys = rows + tail
+            self._shown = len(rows)
+
+        kept = set(keys)
+        self._contents = {k: v for k, v in self._contents.items() if k in kept}
+        replace_rows(self, self._keys[:self._shown], keys[:shown], store)
+        self._keys = keys
+
+    def forget(self, keys):
+        """Drop the cached text of entries changed elsewhere; visible ones reload"""
+        keys = set(keys) & set(self._contents)
+        if not keys:
+            return
+        for key in keys:
+            del self._contents[key]
+        for row, key in enumerate(self._keys[:self._shown]):
+            if key in keys:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def upsert(self, key, content):
+        """Add or replace one entry without touching the others"""
+        self._contents[key] = content
+        if key in self._keys:
+            row = self._keys.index(key)
+            if row < self._shown:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+            return
+
+        row = 0
+        while row < len(self._keys) and self._keys[row] > key:
+            row += 1
+        if row <= self._shown:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._keys.insert(row, key)
+            self._shown += 1
+            self.endInsertRows()
+        else:
+            self._keys.insert(row, key)
+
+    def _request(self, key):
+        if key in self._requested:
+            return
+        self._requested.add(key)
+        if not self._load_scheduled:
+            # Collect every row the view asks for in this paint into one batch
+            self._load_scheduled = True
+            QTimer.singleShot(0, self._load_requested)
+
+    def _load_requested(self):
+        self._load_scheduled = False
+        keys = [key for key in self._requested if key not in self._contents]
+        if keys:
+            run_in_background(self._read_batch, keys, on_done=self._apply_batch)
+
+    @instrumented(name="history_read_batch")
+    def _read_batch(self, keys):
+        return {key: self.read_entry(key) or "" for key in keys}
+
+    @instrumented(name="history_apply_batch")
+    def _apply_batch(self, contents):
+        self._contents.update(contents)
+        self._requested.difference_update(contents)
+        rows = {key: row for row, key in enumerate(self._keys[:self._shown])}
+        for key in contents:
+            row = rows.get(key)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+
+def create_history_view(model):
+    view = QListView()
+    view.setModel(model)
+    view.setWordWrap(True)
+    view.setSpacing(6)
+    view.setAlternatingRowColors(True)
+    view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+    return view
+
+
+class TaskListModel(QAbstractListModel):
+    """Checkable task list backed by plain (text, done) data.
+
+    The model, not the view, is the source of truth: loading, deleting and
+    saving all work on ``_texts``/``_done``, and a QListView only creates
+    paint work for the rows that are on screen.
+
+    ``edited`` fires when the user changes a row through the view, but not
+    when the list is replaced or extended from code.
+    """
+
+    edited = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._texts = []
+        self._done = []
+        self._done_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._texts)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._texts[row]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self._done[row] else Qt.CheckState.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+        if role == Qt.ItemDataRole.CheckStateRole:
+            done = Qt.CheckState(value) == Qt.CheckState.Checked
+            if done == self._done[row]:
+                return False
+            self._done[row] = done
+            self._done_count += 1 if done else -1
+        elif role == Qt.ItemDataRole.EditRole:
+            text = str(value).strip()
+            if not text or text == self._texts[row]:
+                return False
+            self._texts[row] = text
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        self.edited.emit()
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEditable)
+
+    def tasks(self):
+        """Return the tasks as (text, done) pairs"""
+        return list(zip(self._texts, self._done))
+
+    def texts(self):
+        return list(self._texts)
+
+    def checked_count(self):
+        return self._done_count
+
+    def set_tasks(self, tasks):
+        """Replace every task, touching only the rows that differ"""
+        replace_rows(self, self.tasks(), [(text, bool(done)) for text, done in tasks],
+                     self._store)
+
+    def _store(self, tasks):
+        self._texts = [text for text, _ in tasks]
+        self._done = [done for _, done in tasks]
+        self._done_count = sum(self._done)
+
+    def add_task(self, text, done=False):
+        self.add_tasks([(text, done)])
+
+    def add_tasks(self, tasks):
+        """Append tasks with a single row insertion"""
+        if not tasks:
+            return
+        row = len(self._texts)
+        self.beginInsertRows(QModelIndex(), row, row + len(tasks) - 1)
+        self._texts.extend(text for text, _ in tasks)
+        done = [bool(done) for _, done in tasks]
+        self._done.extend(done)
+        self._done_count += sum(done)
+        self.endInsertRows()
+
+    def remove_checked(self):
+        """Remove every checked task and return how many were removed"""
+        removed = self._done_count
+        if not removed:
+            return 0
+
+        blocks = []
+        row = len(self._done) - 1
+        while row >= 0:
+            if self._done[row]:
+                last = row
+                while row >= 0 and self._done[row]:
+                    row -= 1
+                blocks.append((row + 1, last))
+            row -= 1
+
+        if len(blocks) > 64:
+            # Scattered selections are cheaper to apply as one rebind
+            self.set_tasks([(text, False) for text, done in self.tasks() if not done])
+            return removed
+
+        # Blocks are in descending order, so earlier rows keep their index
+        for first, last in blocks:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._texts[first:last + 1]
+            del self._done[first:last + 1]
+            self.endRemoveRows()
+        self._done_count = 0
+        return removed
+
+
+def create_task_view(model):
+    """List view for a TaskListModel; uniform rows keep layout O(visible)"""
+    view = QListView()
+    view.setModel(model)
+    view.setUniformItemSizes(True)
+    view.setEditTriggers(QListView.EditTrigger.DoubleClicked
+                         | QListView.EditTrigger.EditKeyPressed)
+    return view
+
+
+class LineChart:
+    """A chart with one persistent line that is updated in place.
+
+    The line is an animated artist, so a data change that keeps the axis
+    limits only restores the cached background and blits the line. A full
+    draw happens only when the limits or the empty-state label change.
+
+    The full series is kept aside and the line only ever holds the visible
+    range, downsampled with LTTB to the axes' width in pixels. The wheel
+    zooms the x axis and a double-click resets it; both re-decimate.
+    """
+
+    def __init__(self, title, label, color, marker, empty_text):
+        # matplotlib is only imported once the Chart tab is first shown
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(6, 3), facecolor='#f0f0f0')
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvas(self.figure)
+
+        self.line, = self.ax.plot(
+            [], [], marker=marker, color=color, label=label,
+            linestyle="-", linewidth=2, animated=True,
+        )
+        self.empty_label = self.ax.text(
+            0.5, 0.5, empty_text, ha='center', va='center', fontsize=12,
+            transform=self.ax.transAxes,
+        )
+        self.ax.set_title(title)
+        self.ax.set_ylabel("Score")
+        self.ax.tick_params(axis="x", rotation=45)
+        self.ax.legend(loc="upper left")
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+
+        # Fixed margins leave room for the rotated tick labels without
+        # running a layout pass on every draw
+        self.figure.subplots_adjust(left=0.1, right=0.97, top=0.88, bottom=0.3)
+
+        self.marker = marker
+        self._x = []
+        self._y = []
+        self._zoomed = False
+        self._autoscaling = False
+        self.on_drawn = None  # called after every full draw or blit
+
+        # Full draws are deferred through draw_idle(), so they are timed
+        # where the canvas runs them rather than in set_data()
+        self.canvas.draw = instrumented(name="chart_draw")(self.canvas.draw)
+
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", lambda event: self._redecimate())
+        self.canvas.mpl_connect("scroll_event", self._on_scroll)
+        self.canvas.mpl_connect("button_press_event", self._on_press)
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.ax.draw_artist(self.line)
+        if self.on_drawn is not None:
+            self.on_drawn()
+
+    def _visible_points(self):
+        """The points inside the x limits, at most one per horizontal pixel"""
+        x0, x1 = self.ax.get_xlim()
+        # One point beyond each edge keeps the line running off the axes
+        lo = max(bisect_left(self._x, x0) - 1, 0)
+        hi = min(bisect_right(self._x, x1) + 1, len(self._x))
+        xs, ys = self._x[lo:hi], self._y[lo:hi]
+
+        width = max(int(self.ax.bbox.width), 3)
+        if len(xs) > width:
+            xs, ys = lttb(xs, ys, width)
+        # Markers only add ink once they start to overlap
+        self.line.set_marker(self.marker if len(xs) <= width // 8 else "None")
+        return xs, ys
+
+    def _autoscale(self):
+        """Fit the axes to the full series, keeping a user zoom on x"""
+        self._autoscaling = True
+        try:
+            self.line.set_data(self._x, self._y)
+            self.ax.relim()
+            self.ax.autoscale_view(scalex=not self._zoomed)
+            self.line.set_data(*self._visible_points())
+        finally:
+            self._autoscaling = False
+
+    def _redecimate(self):
+        if self._x:
+            self.line.set_data(*self._visible_points())
+            self.canvas.draw_idle()
+
+    def _on_xlim_changed(self, ax):
+        if not self._autoscaling:
+            self._redecimate()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or not self._x:
+            return
+        factor = 0.8 if event.button == "up" else 1.25
+        x0, x1 = self.ax.get_xlim()
+        center = event.xdata
+        self._zoomed = True
+        self.ax.set_xlim(center - (center - x0) * factor, center + (x1 - center) * factor)
+
+    def _on_press(self, event):
+        if event.dblclick and event.inaxes is self.ax and self._zoomed:
+            self._zoomed = False
+            self._autoscale()
+            self.canvas.draw_idle()
+
+    def set_data(self, x, y):
+        """Replace the line's data and redraw as little as possible"""
+        old_limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        has_data = len(x) > 0
+
+        self._x = list(x)
+        self._y = list(y)
+        empty_changed = self.empty_label.get_visible() == has_data
+        self.empty_label.set_visible(not has_data)
+        if has_data:
+            self._autoscale()
+        else:
+            self.line.set_data([], [])
+
+        if (empty_changed or self._background is None
+                or (self.ax.get_xlim(), self.ax.get_ylim()) != old_limits):
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+            self.canvas.blit(self.ax.bbox)
+            if self.on_drawn is not None:
+                self.on_drawn()
+
+
+class CachedChart(QStackedWidget):
+    """A LineChart that shows its last rendered image until it is needed.
+
+    Every unzoomed render is saved to the image cache under a key made of
+    the data's fingerprint and the widget's pixel size. When data arrives
+    whose key is cached, the image is shown and matplotlib is not touched.
+    The live chart is built on a cache miss, on a resize to an uncached
+    size, or on the first click or wheel over the image.
+    """
+
+    CACHE_VERSION = 1  # bump when the chart styling changes
+
+    def __init__(self, name, make_chart, cache, convert_x=list):
+        super().__init__()
+        self.name = name
+        self.make_chart = make_chart
+        self.cache = cache
+        self.convert_x = convert_x  # raw x values -> plot coordinates
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # The image must not drive the layout, or cached and live sizes differ
+        self.image_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.image_label.setToolTip("Click to interact")
+        self.image_label.installEventFilter(self)
+        self.addWidget(self.image_label)
+
+        self.chart = None
+        self._series = None  # (fingerprint, raw x, y)
+        self._snapshot_scheduled = False
+
+    def sizeHint(self):
+        return QSize(600, 300)  # the LineChart figure's size
+
+    def _key(self):
+        ratio = self.devicePixelRatioF()
+        return fingerprint(self.CACHE_VERSION, self.name, self._series[0],
+                           round(self.width() * ratio), round(self.height() * ratio))
+
+    def set_series(self, data_fingerprint, xs, ys):
+        self._series = (data_fingerprint, xs, ys)
+        self._show()
+
+    def _show(self):
+        if self._series is None:
+            return
+        if self.chart is None:
+            path = self.cache.get(self._key())
+            if path is not None:
+                pixmap = QPixmap(path)
+                if not pixmap.isNull():
+                    pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+                    self.image_label.setPixmap(pixmap)
+                    self.setCurrentWidget(self.image_label)
+                    return
+            self.ensure_live()
+            return
+        _, xs, ys = self._series
+        self.chart.set_data(self.convert_x(xs), ys)
+
+    def ensure_live(self):
+        """Build the matplotlib chart (once) and give it the current data"""
+        if self.chart is None:
+            self.chart = self.make_chart()
+            self.chart.on_drawn = self._schedule_snapshot
+            self.addWidget(self.chart.canvas)
+            self.setCurrentWidget(self.chart.canvas)
+            self._show()
+        return self.chart
+
+    def eventFilter(self, obj, event):
+        if obj is self.image_label and event.type() in (
+            QEvent.Type.MouseButtonPress, QEvent.Type.Wheel
+        ):
+            self.ensure_live()
+            return True
+        return super().eventFilter(obj, event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.chart is None:
+            self._show()
+
+    def _schedule_snapshot(self):
+        if not self._snapshot_scheduled:
+            self._snapshot_scheduled = True
+            QTimer.singleShot(0, self._store_snapshot)
+
+    def _store_snapshot(self):
+        """Save what the live chart shows, unless the user has zoomed it"""
+        self._snapshot_scheduled = False
+        if self._series is None or self.chart is None or self.chart._zoomed:
+            return
+        key = self._key()
+        if self.cache.contains(key):
+            return
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        self.chart.canvas.grab().save(buffer, "PNG")
+        try:
+            self.cache.put(key, bytes(buffer.data()))
+        except OSError as e:
+            print(f"Error caching chart image: {e}")
+
+
+class ImportTasksDialog(QDialog):
+    """Paste a list or pick a text/CSV file of tasks to add in one batch"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Tasks")
+        self.resize(480, 400)
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel(
+            "One task per line. Bullets, [x] checkboxes and 1|task lines are understood."
+        ))
+        self.text_edit = QTextEdit()
+        layout.addWidget(self.text_edit)
+
+        btn_frame = QFrame()
+        btn_layout = QHBoxLayout(btn_frame)
+        file_btn = QPushButton("Load File...")
+        file_btn.clicked.connect(self.load_file)
+        btn_layout.addWidget(file_btn)
+        import_btn = QPushButton("Import")
+        import_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(import_btn)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addWidget(btn_frame)
+
+        self.file_tasks = None
+
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Tasks", "", "Task lists (*.txt *.csv);;All files (*)"
+        )
+        if not path:
+            return
+        try:
+            self.file_tasks = read_task_file(path)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "Import Error", f"Could not read {path}: {str(e)}")
+            return
+        self.accept()
+
+    def tasks(self):
+        if self.file_tasks is not None:
+            return self.file_tasks
+        return parse_task_text(self.text_edit.toPlainText())
+
+
+class DiagnosticsDialog(QDialog):
+    """p50/p95 timings and I/O per instrumented operation"""
+
+    COLUMNS = ["Operation", "Calls", "p50 ms", "p95 ms", "Max ms",
+               "Avg read", "Avg written"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(720, 420)
+        layout = QVBoxLayout(self)
+
+        self.enabled_checkbox = QCheckBox("Record timings")
+        self.enabled_checkbox.setChecked(PROFILER.enabled)
+        self.enabled_checkbox.toggled.connect(
+            lambda on: PROFILER.enable() if on else PROFILER.disable()
+        )
+        layout.addWidget(self.enabled_checkbox)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        layout.addWidget(QLabel(f"Metrics file: {PROFILER.metrics_path}"))
+
+        btn_frame = QFrame()
+        btn_layout = QHBoxLayout(btn_frame)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(lambda: (PROFILER.reset(), self.refresh()))
+        btn_layout.addWidget(reset_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addWidget(btn_frame)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        rows = PROFILER.summary()
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = [
+                row["op"], str(row["calls"]),
+                f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['max_ms']:.2f}",
+                format_bytes(row["avg_read"]), format_bytes(row["avg_written"]),
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(i, column, QTableWidgetItem(value))
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
 
 class TaskManagerApp(QMainWindow):
@@ -23,47 +801,114 @@ class TaskManagerApp(QMainWindow):
         # Initialize variables
         self.goal_date = None
         self.data_dir = "task_data"  # Changed from market_data to task_data
-        os.makedirs(self.data_dir, exist_ok=True)
+        PROFILER.configure(os.path.join(self.data_dir, "metrics.jsonl"))
+        self.storage = open_storage(self.data_dir, write_behind=True)
+        # Quit through the event loop: raising KeyboardInterrupt there would
+        # only print a traceback, and closing from inside the handler could
+        # interrupt a save
+        install_flush_handlers(
+            self.storage.flush,
+            quit=lambda signum: QTimer.singleShot(0, lambda: self.quit_on_signal(signum)),
+        )
+        self.analytics = Analytics(self.data_dir)
+        self.chart_cache = ImageCache(os.path.join(self.data_dir, "chart_cache"))
+        # The search index loads on a worker thread the first time it is
+        # needed; changes saved while it loads are queued in the backlog
+        self._search_index = None
+        self._search_lock = threading.Lock()
+        self._search_backlog = None
+        self._search_loading = False
+        self._search_ready = False
+        self._search_waiting = []
+        self.storage.add_save_hook(self.index_entry)
+
+        # Python signal handlers only run between bytecodes, so give the
+        # interpreter a slice of the Qt event loop to notice SIGINT/SIGTERM
+        self.signal_timer = QTimer(self)
+        self.signal_timer.timeout.connect(lambda: None)
+        self.signal_timer.start(500)
 
         # Default tasks
-        self.default_tasks = [
-            "Review daily goals",
-            "Complete priority tasks",
-            "Learning session",
-            "Exercise",
-            "Plan next day"
-        ]
-        
-        self.weekly_tasks = [f"Week {i + 1}" for i in range(13)]
+        self.default_tasks = list(DEFAULT_TASKS)
+        self.weekly_tasks = list(WEEKLY_TASKS)
         self.weekly_checkboxes = []
-        self.todo_checkboxes = []
-        self.learning_checkboxes = []
+        self.todo_model = TaskListModel(self)
+        self.learning_model = TaskListModel(self)
+        self.learning_model.edited.connect(self.save_learning_tasks)
+        # The lists as last loaded or saved; saves merge edits made elsewhere
+        # since, and reloads keep the unsaved edits made on top of them
+        self.todo_base = None
+        self.todo_date = None
+        self.progress_base = None
+        self.learning_base = None
+        self.week_labels = []
+        self.chart_dirty = True
+        self.stats_dirty = True
+        self.goal_date_edits = []
+        self.goal_lock_set = False  # the lock only applies once a goal is set
+        self.built_tabs = set()
 
         self.initialize_data_files()
         self.create_main_widgets()
+
+        # File reads and parsing run on the pool; the UI only applies results
+        self.tasks_loader = BackgroundLoader(
+            self._read_tasks, self._apply_tasks,
+            busy_widget=self.tab_todo,
+            on_error=lambda message: QMessageBox.critical(
+                self, "Error", f"Failed to load tasks: {message}"
+            ),
+        )
+        self.progress_loader = BackgroundLoader(
+            self._read_progress, self._apply_progress,
+            busy_widget=self.tab_progress,
+            on_error=lambda message: print(f"Error reading progress: {message}"),
+        )
+        self.learning_loader = BackgroundLoader(
+            self._read_learning_tasks, self._apply_learning_tasks,
+            busy_widget=self.tab_learning,
+            on_error=lambda message: QMessageBox.critical(
+                self, "Error", f"Failed to load learning tasks: {message}"
+            ),
+        )
+        self.stats_loader = BackgroundLoader(
+            self._read_stats, self._apply_stats,
+            on_error=lambda message: print(f"Error computing stats: {message}"),
+        )
+        self.chart_loader = BackgroundLoader(
+            self._read_chart_series, self._apply_chart_series,
+            on_error=lambda message: QMessageBox.critical(
+                self, "Chart Error", f"Failed to update chart: {message}"
+            ),
+        )
+
+        # Changes made by other programs reload only the part they affect.
+        # Events are collected for a moment so a burst becomes one batch.
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_data_changed)
+        self.watcher.fileChanged.connect(self.on_data_changed)
+        self._changed_paths = set()
+        self._burst_started = 0.0
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload_changed)
+        # Other copies of the app and scripts bump a change counter; polling
+        # it also catches changes the watcher cannot see (network drives)
+        self.change_poll_timer = QTimer(self)
+        self.change_poll_timer.timeout.connect(self.poll_other_writers)
+        self.change_poll_timer.start(2000)
+
         self.load_initial_data()
 
     def initialize_data_files(self):
-        """Create necessary data files if they don't exist with proper validation"""
-        required_files = {
-            "task_score.csv": "",
-            "progress.txt": "",
-            "custom_tasks.txt": "\n".join(self.default_tasks),
-            "learning_tasks.txt": "\n".join(["Python Programming|0", 
-                                           "Data Structures|0",
-                                           "Algorithms|0"])
-        }
-        
-        for file, default_content in required_files.items():
-            path = os.path.join(self.data_dir, file)
-            if not os.path.exists(path):
-                try:
-                    with open(path, "w", encoding="utf-8") as f:
-                        f.write(default_content)
-                except Exception as e:
-                    print(f"Error creating {file}: {e}")
-                    QMessageBox.warning(self, "File Error", 
-                                      f"Could not create {file}: {str(e)}")
+        """Store the default task lists if they were never saved"""
+        try:
+            initialize_defaults(self.storage)
+        except Exception as e:
+            print(f"Error creating default task lists: {e}")
+            QMessageBox.warning(self, "File Error",
+                                f"Could not create default task lists: {str(e)}")
 
     # بقیه متدها بدون تغییر می‌مانند...
     def create_main_widgets(self):
@@ -78,6 +923,7 @@ class TaskManagerApp(QMainWindow):
         self.tab_daily = QWidget()
         self.tab_weekly = QWidget()
         self.tab_chart = QWidget()
+        self.tab_stats = QWidget()
         self.tab_history = QWidget()
 
         self.tab_widget.addTab(self.tab_todo, "To-Do List")
@@ -86,47 +932,129 @@ class TaskManagerApp(QMainWindow):
         self.tab_widget.addTab(self.tab_daily, "Daily Log")
         self.tab_widget.addTab(self.tab_weekly, "Weekly Review")
         self.tab_widget.addTab(self.tab_chart, "Chart")
+        self.tab_widget.addTab(self.tab_stats, "Stats")
         self.tab_widget.addTab(self.tab_history, "History")
 
-        self.setup_todo_tab()
-        self.setup_progress_tab()
-        self.setup_learning_tab()
-        self.setup_daily_tab()
-        self.setup_weekly_tab()
-        self.setup_chart_tab()
-        self.setup_history_tab()
+        # Tabs are filled in on first activation; each entry is the setup
+        # method and the loader that populates it
+        self.tab_builders = {
+            self.tab_todo: (self.setup_todo_tab, self.load_tasks),
+            self.tab_progress: (self.setup_progress_tab, self.load_progress),
+            self.tab_learning: (self.setup_learning_tab, self.load_learning_tasks),
+            self.tab_daily: (self.setup_daily_tab, None),
+            self.tab_weekly: (self.setup_weekly_tab, None),
+            self.tab_chart: (self.setup_chart_tab, None),
+            self.tab_stats: (self.setup_stats_tab, None),
+            self.tab_history: (self.setup_history_tab, self.load_history),
+        }
 
-    def setup_todo_tab(self):
-        """Setup to-do list tab"""
-        layout = QVBoxLayout(self.tab_todo)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
-        # Goal date controls
+        tools_menu = self.menuBar().addMenu("Tools")
+        tools_menu.addAction("Export Data...", self.export_all_data)
+        tools_menu.addAction("Diagnostics...", self.show_diagnostics)
+
+    def export_all_data(self):
+        """Stream every task list, log, review and score to a JSONL or CSV file"""
+        path, chosen_filter = QFileDialog.getSaveFileName(
+            self, "Export Data", "task_export.jsonl",
+            "JSON Lines (*.jsonl);;CSV (*.csv)",
+        )
+        if not path:
+            return
+        fmt = "csv" if chosen_filter.startswith("CSV") else "jsonl"
+        if not os.path.splitext(path)[1]:
+            path += f".{fmt}"
+
+        progress = QProgressDialog("Exporting data...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export Data")
+        progress.setMinimumDuration(300)
+        cancel = threading.Event()
+        progress.canceled.connect(cancel.set)
+
+        def update_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finished(count):
+            progress.reset()
+            if count is not None:
+                QMessageBox.information(self, "Export Complete",
+                                        f"Exported {count} records to {path}")
+
+        def failed(message):
+            progress.reset()
+            QMessageBox.critical(self, "Export Error", f"Failed to export data: {message}")
+
+        run_in_background(
+            lambda progress: export_data(self.storage, path, fmt, progress, cancel.is_set),
+            on_done=finished, on_error=failed, on_progress=update_progress,
+        )
+
+    def show_diagnostics(self):
+        """Open the timing/I/O panel for the instrumented methods"""
+        DiagnosticsDialog(self).show()
+
+    def ensure_tab(self, tab):
+        """Build a tab and load its data the first time it is needed"""
+        if tab in self.built_tabs:
+            return
+        self.built_tabs.add(tab)
+
+        setup, load = self.tab_builders[tab]
+        setup()
+        if load is not None:
+            load()
+        if tab in (self.tab_daily, self.tab_weekly, self.tab_learning):
+            self.apply_goal_lock([tab])
+
+    def build_all_tabs(self):
+        for tab in self.tab_builders:
+            self.ensure_tab(tab)
+
+    def on_tab_changed(self, index):
+        """Build the tab on first show and refresh the chart or stats if dirty"""
+        tab = self.tab_widget.widget(index)
+        self.ensure_tab(tab)
+        if tab is self.tab_chart and self.chart_dirty:
+            self.update_chart()
+        if tab is self.tab_stats and self.stats_dirty:
+            self.update_stats()
+
+    def create_goal_frame(self, layout):
+        """Add the goal date row to a tab and return its line edit"""
         goal_frame = QFrame()
         goal_layout = QHBoxLayout(goal_frame)
         goal_layout.addWidget(QLabel("Goal Date (YYYY-MM-DD):"))
 
-        self.goal_date_edit = QLineEdit()
-        goal_layout.addWidget(self.goal_date_edit)
+        goal_date_edit = QLineEdit()
+        if self.goal_date:
+            goal_date_edit.setText(self.goal_date.toString("yyyy-MM-dd"))
+        self.goal_date_edits.append(goal_date_edit)
+        goal_layout.addWidget(goal_date_edit)
 
         set_goal_btn = QPushButton("Set Goal")
         set_goal_btn.clicked.connect(self.save_goal_date)
         goal_layout.addWidget(set_goal_btn)
 
         layout.addWidget(goal_frame)
+        return goal_date_edit
+
+    def setup_todo_tab(self):
+        """Setup to-do list tab"""
+        layout = QVBoxLayout(self.tab_todo)
+
+        # Goal date controls
+        self.goal_date_edit = self.create_goal_frame(layout)
 
         # Task entry
         self.todo_entry = QLineEdit()
         self.todo_entry.setPlaceholderText("Enter a new task")
         layout.addWidget(self.todo_entry)
 
-        # Task list in scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.todo_container = QWidget()
-        self.todo_layout = QVBoxLayout(self.todo_container)
-        self.todo_layout.addStretch()
-        scroll.setWidget(self.todo_container)
-        layout.addWidget(scroll)
+        # Task list
+        self.todo_view = create_task_view(self.todo_model)
+        layout.addWidget(self.todo_view)
 
         # Buttons
         btn_frame = QFrame()
@@ -140,6 +1068,10 @@ class TaskManagerApp(QMainWindow):
         del_btn.clicked.connect(self.delete_task)
         btn_layout.addWidget(del_btn)
 
+        import_btn = QPushButton("Import...")
+        import_btn.clicked.connect(self.import_tasks)
+        btn_layout.addWidget(import_btn)
+
         save_btn = QPushButton("Save Tasks")
         save_btn.clicked.connect(self.save_tasks)
         btn_layout.addWidget(save_btn)
@@ -155,18 +1087,7 @@ class TaskManagerApp(QMainWindow):
         layout = QVBoxLayout(self.tab_progress)
 
         # Goal date controls
-        goal_frame = QFrame()
-        goal_layout = QHBoxLayout(goal_frame)
-        goal_layout.addWidget(QLabel("Goal Date (YYYY-MM-DD):"))
-
-        self.goal_date_edit_progress = QLineEdit()
-        goal_layout.addWidget(self.goal_date_edit_progress)
-
-        set_goal_btn = QPushButton("Set Goal")
-        set_goal_btn.clicked.connect(self.save_goal_date)
-        goal_layout.addWidget(set_goal_btn)
-
-        layout.addWidget(goal_frame)
+        self.goal_date_edit_progress = self.create_goal_frame(layout)
 
         # Progress checkboxes in scroll area
         scroll = QScrollArea()
@@ -193,32 +1114,16 @@ class TaskManagerApp(QMainWindow):
         layout = QVBoxLayout(self.tab_learning)
 
         # Goal date controls
-        goal_frame = QFrame()
-        goal_layout = QHBoxLayout(goal_frame)
-        goal_layout.addWidget(QLabel("Goal Date (YYYY-MM-DD):"))
-
-        self.goal_date_edit_learning = QLineEdit()
-        goal_layout.addWidget(self.goal_date_edit_learning)
-
-        set_goal_btn = QPushButton("Set Goal")
-        set_goal_btn.clicked.connect(self.save_goal_date)
-        goal_layout.addWidget(set_goal_btn)
-
-        layout.addWidget(goal_frame)
+        self.goal_date_edit_learning = self.create_goal_frame(layout)
 
         # Task entry
         self.learning_entry = QLineEdit()
         self.learning_entry.setPlaceholderText("Enter new learning task")
         layout.addWidget(self.learning_entry)
 
-        # Task list in scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.learning_container = QWidget()
-        self.learning_layout = QVBoxLayout(self.learning_container)
-        self.learning_layout.addStretch()
-        scroll.setWidget(self.learning_container)
-        layout.addWidget(scroll)
+        # Task list
+        self.learning_view = create_task_view(self.learning_model)
+        layout.addWidget(self.learning_view)
 
         # Buttons
         btn_frame = QFrame()
@@ -243,18 +1148,7 @@ class TaskManagerApp(QMainWindow):
         layout = QVBoxLayout(self.tab_daily)
 
         # Goal date controls
-        goal_frame = QFrame()
-        goal_layout = QHBoxLayout(goal_frame)
-        goal_layout.addWidget(QLabel("Goal Date (YYYY-MM-DD):"))
-
-        self.goal_date_edit_daily = QLineEdit()
-        goal_layout.addWidget(self.goal_date_edit_daily)
-
-        set_goal_btn = QPushButton("Set Goal")
-        set_goal_btn.clicked.connect(self.save_goal_date)
-        goal_layout.addWidget(set_goal_btn)
-
-        layout.addWidget(goal_frame)
+        self.goal_date_edit_daily = self.create_goal_frame(layout)
 
         # Date entry
         self.daily_date_edit = QLineEdit()
@@ -290,18 +1184,7 @@ class TaskManagerApp(QMainWindow):
         layout = QVBoxLayout(self.tab_weekly)
 
         # Goal date controls
-        goal_frame = QFrame()
-        goal_layout = QHBoxLayout(goal_frame)
-        goal_layout.addWidget(QLabel("Goal Date (YYYY-MM-DD):"))
-
-        self.goal_date_edit_weekly = QLineEdit()
-        goal_layout.addWidget(self.goal_date_edit_weekly)
-
-        set_goal_btn = QPushButton("Set Goal")
-        set_goal_btn.clicked.connect(self.save_goal_date)
-        goal_layout.addWidget(set_goal_btn)
-
-        layout.addWidget(goal_frame)
+        self.goal_date_edit_weekly = self.create_goal_frame(layout)
 
         # Week number entry
         self.week_number_edit = QLineEdit()
@@ -335,10 +1218,10 @@ class TaskManagerApp(QMainWindow):
         daily_layout = QVBoxLayout(daily_chart_frame)
         daily_layout.addWidget(QLabel("Daily Progress"))
 
-        self.fig_daily = Figure(figsize=(6, 3), facecolor='#f0f0f0')
-        self.ax_daily = self.fig_daily.add_subplot(111)
-        self.canvas_daily = FigureCanvas(self.fig_daily)
-        daily_layout.addWidget(self.canvas_daily)
+        # Charts start as cached images; matplotlib loads on the first miss
+        self.daily_chart = CachedChart("daily", self.make_daily_chart, self.chart_cache,
+                                       convert_x=self.date_numbers)
+        daily_layout.addWidget(self.daily_chart)
 
         layout.addWidget(daily_chart_frame)
 
@@ -347,73 +1230,214 @@ class TaskManagerApp(QMainWindow):
         weekly_layout = QVBoxLayout(weekly_chart_frame)
         weekly_layout.addWidget(QLabel("Weekly Progress"))
 
-        self.fig_weekly = Figure(figsize=(6, 3), facecolor='#f0f0f0')
-        self.ax_weekly = self.fig_weekly.add_subplot(111)
-        self.canvas_weekly = FigureCanvas(self.fig_weekly)
-        weekly_layout.addWidget(self.canvas_weekly)
+        self.weekly_chart = CachedChart("weekly", self.make_weekly_chart, self.chart_cache)
+        weekly_layout.addWidget(self.weekly_chart)
 
         layout.addWidget(weekly_chart_frame)
 
+    @staticmethod
+    def date_numbers(dates):
+        import matplotlib.dates as mdates
+
+        return mdates.date2num(dates).tolist()
+
+    def make_daily_chart(self):
+        import matplotlib.dates as mdates
+
+        chart = LineChart("Daily Progress", "Daily Score", "cyan", "o",
+                          'No daily data available')
+        chart.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        chart.ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))
+        return chart
+
+    def make_weekly_chart(self):
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+        chart = LineChart("Weekly Progress", "Weekly Score", "orange", "s",
+                          'No weekly data available')
+        # Weeks are plotted at 0..n-1 and labelled with their week id
+        chart.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        chart.ax.xaxis.set_major_formatter(FuncFormatter(
+            lambda x, pos: self.week_labels[int(x)]
+            if x == int(x) and 0 <= x < len(self.week_labels) else ""
+        ))
+        return chart
+
+    def setup_stats_tab(self):
+        """Setup streaks, averages and per-task completion rates"""
+        layout = QVBoxLayout(self.tab_stats)
+
+        summary_frame = QFrame()
+        summary_layout = QVBoxLayout(summary_frame)
+        self.stats_labels = {}
+        for key in ("current_streak", "longest_streak", "average_7", "average_30",
+                    "days_tracked"):
+            label = QLabel()
+            self.stats_labels[key] = label
+            summary_layout.addWidget(label)
+        layout.addWidget(summary_frame)
+
+        layout.addWidget(QLabel("Completion rate per task (all to-do lists)"))
+        self.task_rates_table = QTableWidget(0, 4)
+        self.task_rates_table.setHorizontalHeaderLabels(["Task", "Done", "Listed", "Rate"])
+        self.task_rates_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.task_rates_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.task_rates_table)
+
     def setup_history_tab(self):
         """Setup history viewing tab"""
         layout = QVBoxLayout(self.tab_history)
 
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText(
+            "Search logs and reviews (e.g. python, topic:sql, challenges:time)"
+        )
+        self.search_entry.returnPressed.connect(self.search_history)
+        layout.addWidget(self.search_entry)
+
         self.history_tabs = QTabWidget()
         layout.addWidget(self.history_tabs)
 
         # Daily history
-        self.tab_daily_history = QWidget()
-        self.daily_history_layout = QVBoxLayout(self.tab_daily_history)
-
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.daily_scroll_content = QWidget()
-        self.daily_scroll_layout = QVBoxLayout(self.daily_scroll_content)
-        scroll.setWidget(self.daily_scroll_content)
-
-        self.daily_history_layout.addWidget(scroll)
-        self.history_tabs.addTab(self.tab_daily_history, "Daily Log History")
+        self.daily_history_model = HistoryListModel(self.storage.read_daily, self)
+        self.daily_history_view = create_history_view(self.daily_history_model)
+        self.history_tabs.addTab(self.daily_history_view, "Daily Log History")
 
         # Weekly history
-        self.tab_weekly_history = QWidget()
-        self.weekly_history_layout = QVBoxLayout(self.tab_weekly_history)
-
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.weekly_scroll_content = QWidget()
-        self.weekly_scroll_layout = QVBoxLayout(self.weekly_scroll_content)
-        scroll.setWidget(self.weekly_scroll_content)
+        self.weekly_history_model = HistoryListModel(self.storage.read_weekly, self)
+        self.weekly_history_view = create_history_view(self.weekly_history_model)
+        self.history_tabs.addTab(self.weekly_history_view, "Weekly Review History")
 
-        self.weekly_history_layout.addWidget(scroll)
-        self.history_tabs.addTab(self.tab_weekly_history, "Weekly Review History")
+        # Search results
+        self.search_results_model = HistoryListModel(self.read_search_hit, self)
+        self.search_results_view = create_history_view(self.search_results_model)
+        self.history_tabs.addTab(self.search_results_view, "Search Results")
 
+    @instrumented
     def load_initial_data(self):
-        """Load all initial data"""
+        """Load the data the first visible tab needs; other tabs load on demand"""
         self.load_goal_date()
-        self.load_tasks()
-        self.load_progress()
-        self.load_learning_tasks()
+        self.ensure_tab(self.tab_widget.currentWidget())
+        # Parse the score log before the first save or chart needs it
+        run_in_background(self.storage.scores.load)
+        run_in_background(self.storage.watch_paths, on_done=self.watch_paths)
+        # Pack finished months so the data directory stays small
+        run_in_background(self.storage.archive_closed_months,
+                          on_error=lambda message: print(f"Error archiving old tasks: {message}"))
+
+    def watch_paths(self, paths):
+        """Add data directories and files to the watcher if not watched yet"""
+        watched = set(self.watcher.directories()) | set(self.watcher.files())
+        new = [path for path in paths if path not in watched]
+        if new:
+            self.watcher.addPaths(new)
+
+    def on_data_changed(self, path):
+        """Collect watcher events; a burst is handled as one batch"""
+        if not self.reload_timer.isActive():
+            self._burst_started = time.monotonic()
+        self._changed_paths.add(path)
+        # Keep postponing while events arrive, but never for more than 2 s
+        if time.monotonic() - self._burst_started < 2.0:
+            self.reload_timer.start()
+
+    def poll_other_writers(self):
+        run_in_background(self.storage.changed_elsewhere, on_done=self._on_changed_elsewhere)
+
+    def _on_changed_elsewhere(self, changed):
+        if not changed:
+            return
+        paths = self.watcher.directories() + self.watcher.files()
+        if paths:
+            for path in paths:
+                self.on_data_changed(path)
+            return
+        # No files to compare (SQLite): reload whatever may be on screen
+        today = QDate.currentDate().toString("yyyy-MM-dd")
+        self._apply_changes((
+            {"todo": {today}, "list": {"progress", "learning_tasks"}, "goal": {None},
+             "scores": {None}},
+            [],
+        ))
         self.load_history()
-        self.update_chart()
 
+    def reload_changed(self):
+        """Find out on a worker thread what changed, then reload only that"""
+        paths, self._changed_paths = list(self._changed_paths), set()
+        run_in_background(
+            self._poll_changes, paths, on_done=self._apply_changes,
+            on_error=lambda message: print(f"Error checking for changed files: {message}"),
+        )
+
+    @instrumented(name="poll_changes")
+    def _poll_changes(self, paths):
+        return self.storage.poll_changes(paths), self.storage.watch_paths()
+
+    @instrumented(name="poll_changes_apply")
+    def _apply_changes(self, result):
+        changes, paths = result
+        # Replaced files drop out of the watcher, and new shards appear
+        self.watch_paths(paths)
+        if not changes:
+            return
+
+        today = QDate.currentDate().toString("yyyy-MM-dd")
+        todo = changes.get("todo", set())
+        lists = changes.get("list", set())
+        if today in todo and self.tab_todo in self.built_tabs:
+            self.load_tasks()
+        if "progress" in lists and self.tab_progress in self.built_tabs:
+            self.load_progress()
+        if "learning_tasks" in lists and self.tab_learning in self.built_tabs:
+            self.load_learning_tasks()
+        if "goal" in changes:
+            self.load_goal_date()
+
+        if todo or "archive" in changes or "scores" in changes:
+            self.analytics.invalidate(tasks=bool(todo or "archive" in changes),
+                                      scores="scores" in changes)
+            self.stats_dirty = True
+        if "scores" in changes:
+            self.chart_dirty = True
+
+        entries = [(kind, key) for kind in ("daily", "weekly") for key in changes.get(kind, ())]
+        if entries:
+            if self.tab_history in self.built_tabs:
+                self.daily_history_model.forget(changes.get("daily", ()))
+                self.weekly_history_model.forget(changes.get("weekly", ()))
+                self.load_history()
+            run_in_background(self._reindex_entries, entries)
+
+        current = self.tab_widget.currentWidget()
+        if current is self.tab_chart and self.chart_dirty:
+            self.update_chart()
+        if current is self.tab_stats and self.stats_dirty:
+            self.update_stats()
+
+    def _reindex_entries(self, entries):
+        """Bring the search index up to date with entries changed elsewhere"""
+        for kind, key in entries:
+            read = self.storage.read_daily if kind == "daily" else self.storage.read_weekly
+            self.index_entry(kind, key, read(key))
+
+    @instrumented
     def load_goal_date(self):
         """Load goal date from file"""
-        path = os.path.join(self.data_dir, "goal_date.txt")
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    date_str = f.read().strip()
-                    self.goal_date = QDate.fromString(date_str, "yyyy-MM-dd")
-
-                    # Update all goal date entries
-                    for widget in [self.goal_date_edit, self.goal_date_edit_progress,
-                                 self.goal_date_edit_learning, self.goal_date_edit_daily,
-                                 self.goal_date_edit_weekly]:
-                        widget.setText(date_str)
-            except Exception as e:
-                print(f"Error reading goal date: {e}")
-                self.goal_date = None
+        try:
+            date_str = self.storage.read_goal_date()
+            if date_str:
+                self.goal_date = QDate.fromString(date_str, "yyyy-MM-dd")
 
+                # Update all goal date entries
+                for widget in self.goal_date_edits:
+                    widget.setText(date_str)
+        except Exception as e:
+            print(f"Error reading goal date: {e}")
+            self.goal_date = None
+
+    @instrumented
     def save_goal_date(self):
         """Save goal date with validation"""
         date_str = self.sender().parent().findChild(QLineEdit).text()
@@ -426,296 +1450,201 @@ class TaskManagerApp(QMainWindow):
                 QMessageBox.critical(self, "Invalid Date", "Goal date cannot be in the past")
                 return
 
-            with open(os.path.join(self.data_dir, "goal_date.txt"), "w") as f:
-                f.write(date_str)
+            self.storage.write_goal_date(date_str)
             self.goal_date = date
 
             # Update all goal date entries
-            for widget in [self.goal_date_edit, self.goal_date_edit_progress,
-                          self.goal_date_edit_learning, self.goal_date_edit_daily,
-                          self.goal_date_edit_weekly]:
+            for widget in self.goal_date_edits:
                 widget.setText(date_str)
 
             QMessageBox.information(self, "Goal Set", f"Goal date set to {date_str}")
+            self.goal_lock_set = True
             self.apply_goal_lock()
         except ValueError:
             QMessageBox.critical(self, "Invalid Date", "Use YYYY-MM-DD format")
 
-    def apply_goal_lock(self):
+    @instrumented
+    def apply_goal_lock(self, tabs=None):
         """Lock or unlock tabs based on goal date"""
-        if not self.goal_date:
+        if not self.goal_date or not self.goal_lock_set:
             return
 
         locked = QDate.currentDate() < self.goal_date
-        state = Qt.ItemFlag.ItemIsEnabled if not locked else Qt.ItemFlag.ItemIsSelectable
 
-        # Lock/unlock relevant tabs
-        for tab in [self.tab_daily, self.tab_weekly, self.tab_learning]:
+        # Lock/unlock relevant tabs that have been built
+        if tabs is None:
+            tabs = [self.tab_daily, self.tab_weekly, self.tab_learning]
+        for tab in tabs:
+            if tab not in self.built_tabs:
+                continue
             for widget in tab.findChildren(QWidget):
-                if isinstance(widget, QLineEdit) and widget in [
-                    self.goal_date_edit_daily, self.goal_date_edit_weekly,
-                    self.goal_date_edit_learning
-                ]:
+                if isinstance(widget, QLineEdit) and widget in self.goal_date_edits:
                     continue
                 widget.setEnabled(not locked)
 
     def load_tasks(self):
         """Load tasks from file"""
-        today = QDate.currentDate().toString("yyyy-MM-dd")
-        filepath = os.path.join(self.data_dir, f"todo_{today}.txt")
+        self.tasks_loader.load(QDate.currentDate().toString("yyyy-MM-dd"))
+
+    @instrumented(name="load_tasks")
+    def _read_tasks(self, today):
+        return today, *read_day_tasks(self.storage, today)
+
+    @instrumented(name="load_tasks_apply")
+    def _apply_tasks(self, result):
+        today, tasks, new_day = result
+        base = self.todo_base if today == self.todo_date else None
+        self.todo_base = None if new_day else list(tasks)
+        self.todo_date = today
+        try:
+            # Unsaved checks and edits of the same day survive a reload
+            tasks = rebase_edits(base, self.todo_model.tasks(), tasks)
+            # A new day's list is saved for today (all unchecked)
+            self.apply_task_batch(tasks, replace=True, save=new_day)
 
-        # Clear existing checkboxes
-        for i in reversed(range(self.todo_layout.count())):
-            widget = self.todo_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-        self.todo_checkboxes = []
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load tasks: {str(e)}")
 
+    def apply_task_batch(self, tasks, replace=False, save=True):
+        """Put many tasks into the to-do list at once, then save and redraw once"""
+        self.todo_view.setUpdatesEnabled(False)
         try:
-            # First try to load today's tasks
-            if os.path.exists(filepath):
-                with open(filepath, "r", encoding="utf-8") as f:
-                    for line in f:
-                        parts = line.strip().split("|", 1)
-                        if len(parts) == 2:
-                            value, task = parts
-                            self._create_task_checkbox(task, value == "1")
+            if replace:
+                self.todo_model.set_tasks(tasks)
             else:
-                # If no tasks for today, load from custom_tasks.txt or default
-                custom_tasks_path = os.path.join(self.data_dir, "custom_tasks.txt")
-
-                # Check if custom_tasks exists and has content
-                if os.path.exists(custom_tasks_path) and os.path.getsize(custom_tasks_path) > 0:
-                    with open(custom_tasks_path, "r", encoding="utf-8") as f:
-                        tasks = [line.strip() for line in f if line.strip()]
-                else:
-                    tasks = self.default_tasks
-                    # Save default tasks to custom_tasks for future use
-                    with open(custom_tasks_path, "w", encoding="utf-8") as f:
-                        f.write("\n".join(tasks))
-
-                # Create checkboxes for loaded tasks
-                for task in tasks:
-                    self._create_task_checkbox(task)
+                self.todo_model.add_tasks(tasks)
+        finally:
+            self.todo_view.setUpdatesEnabled(True)
+        if save:
+            self.save_tasks()
 
-                # Save these tasks for today (all unchecked)
-                self.save_tasks()
+    def import_tasks(self):
+        """Add a pasted list or a text/CSV file of tasks in one batch"""
+        dialog = ImportTasksDialog(self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load tasks: {str(e)}")
+        parsed = dialog.tasks()
+        tasks = merge_tasks(self.todo_model.texts(), parsed)
+        if not tasks:
+            QMessageBox.information(self, "Info", "No new tasks to import")
+            return
 
-    def _create_task_checkbox(self, task, checked=False):
-        """Helper to create a task checkbox"""
-        cb = QCheckBox(task)
-        cb.setChecked(checked)
-        self.todo_checkboxes.append(cb)
-        self.todo_layout.insertWidget(self.todo_layout.count() - 1, cb)
+        self.apply_task_batch(tasks)
+        skipped = len(parsed) - len(tasks)
+        message = f"Imported {len(tasks)} tasks"
+        if skipped:
+            message += f" ({skipped} already in the list were skipped)"
+        QMessageBox.information(self, "Success", message)
 
     def add_task(self):
         """Add a new task to the list"""
         task = self.todo_entry.text().strip()
         if task:
-            self._create_task_checkbox(task)
+            self.todo_model.add_task(task)
             self.todo_entry.clear()
             self.save_tasks()
 
     def delete_task(self):
         """Delete selected tasks"""
-        deleted = False
-        remaining_checkboxes = []
-
-        for cb in self.todo_checkboxes:
-            if cb.isChecked():
-                cb.deleteLater()
-                deleted = True
-            else:
-                remaining_checkboxes.append(cb)
-
-        if deleted:
-            self.todo_checkboxes = remaining_checkboxes
+        if self.todo_model.remove_checked():
             self.save_tasks()
         else:
             QMessageBox.information(self, "Info", "No tasks selected for deletion")
 
     def reset_to_default_tasks(self):
         """Reset tasks to default list"""
-        # Clear existing checkboxes
-        for i in reversed(range(self.todo_layout.count())):
-            widget = self.todo_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-        self.todo_checkboxes = []
-
-        # Load default tasks
-        for task in self.default_tasks:
-            self._create_task_checkbox(task)
-
-        # Save to custom tasks file
-        custom_tasks_path = os.path.join(self.data_dir, "custom_tasks.txt")
-        with open(custom_tasks_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(self.default_tasks))
-
-        # Save to today's tasks
-        self.save_tasks()
+        # Saving today's tasks also saves them as the custom tasks
+        self.apply_task_batch([(task, False) for task in self.default_tasks], replace=True)
         QMessageBox.information(self, "Success", "Tasks reset to default successfully")
 
+    @instrumented
     def save_tasks(self):
         """Save tasks to file"""
         today = QDate.currentDate().toString("yyyy-MM-dd")
-        score = sum(1 for cb in self.todo_checkboxes if cb.isChecked())
 
         try:
-            # Save today's tasks
-            with open(
-                    os.path.join(self.data_dir, f"todo_{today}.txt"), "w", encoding="utf-8"
-            ) as f:
-                for cb in self.todo_checkboxes:
-                    status = "1" if cb.isChecked() else "0"
-                    f.write(f"{status}|{cb.text()}\n")
-
-            # Update task score CSV
-            task_score_path = os.path.join(self.data_dir, "task_score.csv")
-            updated = False
-            rows = []
-
-            if os.path.exists(task_score_path):
-                with open(task_score_path, "r", encoding="utf-8") as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row and row[0] == today:
-                            row = [today, str(score)]
-                            updated = True
-                        if row:
-                            rows.append(row)
-
-            if not updated:
-                rows.append([today, score])
-
-            with open(task_score_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerows(rows)
-
-            # Update custom tasks file
-            current_tasks = [cb.text() for cb in self.todo_checkboxes]
-            custom_tasks_path = os.path.join(self.data_dir, "custom_tasks.txt")
-            with open(custom_tasks_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(current_tasks))
-
+            # Today's tasks, the score log and the custom tasks
+            tasks = self.todo_model.tasks()
+            base = self.todo_base if self.todo_date == today else None
+            stored = save_day_tasks(self.storage, today, tasks, self.analytics, base=base)
+            self.todo_base, self.todo_date = stored, today
+            if stored != tasks:
+                # Merged with edits saved by another program
+                self.todo_model.set_tasks(stored)
             self.update_chart()
+            self.update_stats()
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save tasks: {str(e)}")
 
+    @instrumented
     def save_daily(self):
         """Save daily log with date validation"""
         date_str = self.daily_date_edit.text()
-        try:
-            date = QDate.fromString(date_str, "yyyy-MM-dd")
-            if not date.isValid():
-                raise ValueError
-
-            if date > QDate.currentDate():
-                QMessageBox.critical(self, "Invalid Date", "Date cannot be in the future")
-                return
-        except ValueError:
-            QMessageBox.critical(self, "Invalid Date", "Please use YYYY-MM-DD format")
+        error = validate_log_date(date_str)
+        if error:
+            QMessageBox.critical(self, "Invalid Date", error)
             return
 
         try:
-            with open(
-                    os.path.join(self.data_dir, f"daily_{date_str}.txt"),
-                    "w",
-                    encoding="utf-8",
-            ) as f:
-                f.write(f"Date: {date_str}\n")
-                f.write(f"Topic Covered: {self.topic_entry.text()}\n")
-                f.write(f"Key Takeaways: {self.takeaway_entry.toPlainText()}\n")
-                f.write(f"Questions: {self.question_entry.toPlainText()}\n")
-                f.write(f"Reflection: {self.reflection_entry.toPlainText()}\n")
+            content = format_daily_log(
+                date_str,
+                self.topic_entry.text(),
+                self.takeaway_entry.toPlainText(),
+                self.question_entry.toPlainText(),
+                self.reflection_entry.toPlainText(),
+            )
+            self.storage.write_daily(date_str, content)
 
             self.topic_entry.clear()
             self.takeaway_entry.clear()
             self.question_entry.clear()
             self.reflection_entry.clear()
 
-            self.load_history()
+            self.patch_history("daily", date_str, content)
             QMessageBox.information(self, "Success", "Daily log saved successfully")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save daily log: {str(e)}")
 
+    @instrumented
     def save_weekly(self):
         """Save weekly review with validation"""
-        week_number = self.week_number_edit.text()
         try:
-            week_num = int(week_number)
-            if not 1 <= week_num <= 52:
-                raise ValueError
+            week_id = review_week_id(self.week_number_edit.text(), QDate.currentDate().year())
         except ValueError:
             QMessageBox.critical(self, "Invalid Input", "Week number must be between 1-52")
             return
 
-        year = QDate.currentDate().year()
-        week_id = f"{year}-W{week_num:02d}"
-
         try:
-            with open(
-                    os.path.join(self.data_dir, f"weekly_{week_id}.txt"),
-                    "w",
-                    encoding="utf-8",
-            ) as f:
-                f.write(f"Week ID: {week_id}\n")
-                f.write(f"Progress Summary: {self.week_summary.toPlainText()}\n")
-                f.write(f"Challenges Faced: {self.week_challenges.toPlainText()}\n")
-                f.write(f"Next Week Plans: {self.week_plans.toPlainText()}\n")
+            content = format_weekly_review(
+                week_id,
+                self.week_summary.toPlainText(),
+                self.week_challenges.toPlainText(),
+                self.week_plans.toPlainText(),
+            )
+            self.storage.write_weekly(week_id, content)
 
             self.week_number_edit.clear()
             self.week_summary.clear()
             self.week_challenges.clear()
             self.week_plans.clear()
 
-            self.load_history()
+            self.patch_history("weekly", week_id, content)
             QMessageBox.information(self, "Success", "Weekly review saved successfully")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save weekly review: {str(e)}")
 
+    @instrumented
     def save_progress(self):
         """Save weekly progress"""
-        week = QDate.currentDate().weekNumber()
-        year = QDate.currentDate().year()
-        week_id = f"{year}-W{week:02d}"
-        score = sum(1 for cb in self.weekly_checkboxes if cb.isChecked())
-
         try:
-            with open(
-                    os.path.join(self.data_dir, "progress.txt"), "w", encoding="utf-8"
-            ) as f:
-                for cb in self.weekly_checkboxes:
-                    status = "1" if cb.isChecked() else "0"
-                    f.write(f"{status}|{cb.text()}\n")
-
-            task_score_path = os.path.join(self.data_dir, "task_score.csv")
-            updated = False
-            rows = []
-
-            if os.path.exists(task_score_path):
-                with open(task_score_path, "r", encoding="utf-8") as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row and row[0] == week_id:
-                            row = [week_id, str(score)]
-                            updated = True
-                        if row:
-                            rows.append(row)
-
-            if not updated:
-                rows.append([week_id, score])
-
-            with open(task_score_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerows(rows)
-
+            tasks = [(cb.text(), cb.isChecked()) for cb in self.weekly_checkboxes]
+            stored = save_weekly_progress(self.storage, tasks, base=self.progress_base)
+            self.progress_base = stored
+            self._show_progress(stored)
             self.update_chart()
             QMessageBox.information(self, "Success", "Weekly progress saved successfully")
 
@@ -724,268 +1653,308 @@ class TaskManagerApp(QMainWindow):
 
     def load_progress(self):
         """Load progress from file"""
-        try:
-            with open(
-                    os.path.join(self.data_dir, "progress.txt"), "r", encoding="utf-8"
-            ) as f:
-                for line in f:
-                    parts = line.strip().split("|", 1)
-                    if len(parts) == 2:
-                        value, task = parts
-                        for cb in self.weekly_checkboxes:
-                            if cb.text() == task:
-                                cb.setChecked(value == "1")
-                                break
-        except FileNotFoundError:
-            pass
+        self.progress_loader.load()
+
+    @instrumented(name="load_progress")
+    def _read_progress(self):
+        return self.storage.read_progress()
+
+    @instrumented(name="load_progress_apply")
+    def _apply_progress(self, progress):
+        base = self.progress_base
+        self.progress_base = list(progress)
+        if base is not None:
+            # Unsaved checkboxes survive a reload
+            shown = dict(base)
+            base = [(cb.text(), shown.get(cb.text(), False)) for cb in self.weekly_checkboxes]
+            edited = [(cb.text(), cb.isChecked()) for cb in self.weekly_checkboxes]
+            progress = rebase_edits(base, edited, progress)
+        self._show_progress(progress)
+
+    def _show_progress(self, progress):
+        for task, done in progress:
+            for cb in self.weekly_checkboxes:
+                if cb.text() == task:
+                    cb.setChecked(done)
+                    break
 
     def load_learning_tasks(self):
         """Load learning tasks from file"""
-        # Clear existing checkboxes
-        for i in reversed(range(self.learning_layout.count())):
-            widget = self.learning_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-        self.learning_checkboxes = []
+        self.learning_loader.load()
 
-        try:
-            if os.path.exists(os.path.join(self.data_dir, "learning_tasks.txt")):
-                with open(os.path.join(self.data_dir, "learning_tasks.txt"), "r", encoding="utf-8") as f:
-                    for line in f:
-                        parts = line.strip().split("|", 1)
-                        if len(parts) == 2:
-                            value, task = parts
-                        else:
-                            value, task = "0", line.strip()
-
-                        cb = QCheckBox(task)
-                        cb.setChecked(value == "1")
-                        cb.stateChanged.connect(self.save_learning_tasks)
-                        self.learning_checkboxes.append(cb)
-                        self.learning_layout.insertWidget(self.learning_layout.count() - 1, cb)
+    @instrumented(name="load_learning_tasks")
+    def _read_learning_tasks(self):
+        return self.storage.read_learning() or []
 
-            self.update_learning_progress()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load learning tasks: {str(e)}")
+    @instrumented(name="load_learning_tasks_apply")
+    def _apply_learning_tasks(self, tasks):
+        base = self.learning_base
+        self.learning_base = list(tasks)
+        self.learning_model.set_tasks(rebase_edits(base, self.learning_model.tasks(), tasks))
+        self.update_learning_progress()
 
     def add_learning_task(self):
         """Add a new learning task"""
         task = self.learning_entry.text().strip()
         if task:
-            cb = QCheckBox(task)
-            cb.stateChanged.connect(self.save_learning_tasks)
-            self.learning_checkboxes.append(cb)
-            self.learning_layout.insertWidget(self.learning_layout.count() - 1, cb)
+            self.learning_model.add_task(task)
             self.learning_entry.clear()
             self.save_learning_tasks()
 
     def delete_learning_task(self):
         """Delete selected learning tasks"""
-        deleted = False
-        remaining_checkboxes = []
-
-        for cb in self.learning_checkboxes:
-            if cb.isChecked():
-                cb.deleteLater()
-                deleted = True
-            else:
-                remaining_checkboxes.append(cb)
-
-        if deleted:
-            self.learning_checkboxes = remaining_checkboxes
+        if self.learning_model.remove_checked():
             self.save_learning_tasks()
         else:
             QMessageBox.information(self, "Info", "No tasks selected for deletion")
 
+    @instrumented
     def save_learning_tasks(self):
         """Save learning tasks to file"""
         try:
-            with open(os.path.join(self.data_dir, "learning_tasks.txt"), "w", encoding="utf-8") as f:
-                for cb in self.learning_checkboxes:
-                    status = "1" if cb.isChecked() else "0"
-                    f.write(f"{status}|{cb.text()}\n")
-
+            tasks = self.learning_model.tasks()
+            stored = self.storage.write_learning(tasks, base=self.learning_base)
+            self.learning_base = stored
+            if stored != tasks:
+                self.learning_model.set_tasks(stored)
             self.update_learning_progress()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not save learning tasks: {str(e)}")
 
     def update_learning_progress(self):
         """Update learning progress label"""
-        total = len(self.learning_checkboxes)
+        total = self.learning_model.rowCount()
         if total == 0:
             self.learning_progress_label.setText("No tasks available")
             return
 
-        done = sum(1 for cb in self.learning_checkboxes if cb.isChecked())
+        done = self.learning_model.checked_count()
         percent = (done / total) * 100 if total > 0 else 0
         self.learning_progress_label.setText(
             f"Progress: {done}/{total} tasks ({percent:.0f}%)"
         )
 
+    @instrumented
     def load_history(self):
-        """Load history from files"""
-        try:
-            # Clear existing history
-            for i in reversed(range(self.daily_scroll_layout.count())):
-                widget = self.daily_scroll_layout.itemAt(i).widget()
-                if widget is not None:
-                    widget.deleteLater()
-
-            for i in reversed(range(self.weekly_scroll_layout.count())):
-                widget = self.weekly_scroll_layout.itemAt(i).widget()
-                if widget is not None:
-                    widget.deleteLater()
-
-            # Load daily history
-            daily_files = sorted(
-                [f for f in os.listdir(self.data_dir) if f.startswith("daily_")],
-                key=lambda x: datetime.datetime.strptime(x[6:-4], "%Y-%m-%d"),
-                reverse=True,
-            )
+        """List history entries on a worker thread and show the newest page"""
+        if self.tab_history not in self.built_tabs:
+            return
 
-            for file in daily_files[:10]:
-                filepath = os.path.join(self.data_dir, file)
-                with open(filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                label = QLabel(file.replace("daily_", "").replace(".txt", ""))
-                label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-                self.daily_scroll_layout.addWidget(label)
-
-                text_edit = QTextEdit()
-                text_edit.setPlainText(content)
-                text_edit.setReadOnly(True)
-                self.daily_scroll_layout.addWidget(text_edit)
-
-            # Load weekly history
-            weekly_files = sorted(
-                [f for f in os.listdir(self.data_dir) if f.startswith("weekly_")],
-                key=lambda x: x.replace("weekly_", "").replace(".txt", ""),
-                reverse=True,
-            )
+        self.ensure_search_index()
 
-            for file in weekly_files[:5]:
-                filepath = os.path.join(self.data_dir, file)
-                with open(filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
+        run_in_background(
+            self._list_history_keys,
+            on_done=self._apply_history_keys,
+            on_error=lambda message: QMessageBox.warning(
+                self, "Load Error", f"Error loading history: {message}"
+            ),
+        )
 
-                label = QLabel(file.replace("weekly_", "").replace(".txt", ""))
-                label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-                self.weekly_scroll_layout.addWidget(label)
+    def index_entry(self, kind, key, content):
+        """Apply a saved entry to the search index (any thread)"""
+        with self._search_lock:
+            index = self._search_index
+            if index is None:
+                if self._search_backlog is not None:
+                    self._search_backlog.append((kind, key, content))
+                else:
+                    append_update(self.data_dir, kind, key, content)
+                return
+        index.update(kind, key, content)
 
-                text_edit = QTextEdit()
-                text_edit.setPlainText(content)
-                text_edit.setReadOnly(True)
-                self.weekly_scroll_layout.addWidget(text_edit)
+    def ensure_search_index(self, then=None):
+        """Load the search index on a worker thread; ``then`` runs once it is ready"""
+        if self._search_ready:
+            if then is not None:
+                then()
+            return
+        if then is not None:
+            self._search_waiting.append(then)
+        if self._search_loading:
+            return
 
-        except Exception as e:
-            QMessageBox.warning(self, "Load Error", f"Error loading history: {str(e)}")
+        self._search_loading = True
+        with self._search_lock:
+            if self._search_index is None:
+                self._search_backlog = []
+        run_in_background(
+            self._open_search_index,
+            on_done=self._search_index_ready,
+            on_error=self._search_index_failed,
+        )
 
-    def update_chart(self):
-        """Update progress charts"""
-        try:
-            # Clear previous charts
-            self.ax_daily.clear()
-            self.ax_weekly.clear()
-
-            # Load data from CSV
-            daily_dates = []
-            daily_scores = []
-            weekly_data = {}
-
-            try:
-                with open(
-                        os.path.join(self.data_dir, "task_score.csv"), "r", encoding="utf-8"
-                ) as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if not row or len(row) < 2:
-                            continue
-
-                        # Daily data
-                        try:
-                            date = datetime.datetime.strptime(row[0], "%Y-%m-%d").date()
-                            score = int(row[1])
-                            daily_dates.append(date)
-                            daily_scores.append(score)
-                            continue
-                        except ValueError:
-                            pass
-
-                        # Weekly data
-                        try:
-                            if row[0].count('-W') == 1:  # Format: YYYY-WNN
-                                year, week = row[0].split('-W')
-                                weekly_data[(int(year), int(week))] = int(row[1])
-                        except (ValueError, IndexError):
-                            continue
-
-            except FileNotFoundError:
-                # Show "No data" message if file doesn't exist
-                self.ax_daily.text(0.5, 0.5, 'No daily data available',
-                                  ha='center', va='center', fontsize=12)
-                self.ax_weekly.text(0.5, 0.5, 'No weekly data available',
-                                   ha='center', va='center', fontsize=12)
-                self.canvas_daily.draw()
-                self.canvas_weekly.draw()
-                return
+    def _open_search_index(self):
+        index = self._search_index
+        if index is None:
+            index = SearchIndex(self.data_dir)
+            with self._search_lock:
+                backlog, self._search_backlog = self._search_backlog, None
+                self._search_index = index
+            for kind, key, content in backlog:
+                index.update(kind, key, content)
+        if index.needs_rebuild:
+            # One full scan the first time; saves keep it current afterwards
+            index.rebuild(self.storage)
+
+    def _search_index_ready(self, _):
+        self._search_loading = False
+        self._search_ready = True
+        waiting, self._search_waiting = self._search_waiting, []
+        for then in waiting:
+            then()
+
+    def _search_index_failed(self, message):
+        self._search_loading = False
+        self._search_waiting = []
+        with self._search_lock:
+            backlog, self._search_backlog = self._search_backlog or [], None
+            for kind, key, content in backlog:
+                append_update(self.data_dir, kind, key, content)
+        QMessageBox.warning(self, "Search Error", f"Error loading the search index: {message}")
+
+    def search_history(self):
+        """Show entries matching the search box, best match first"""
+        query = self.search_entry.text().strip()
+        if not query:
+            return
+        self.ensure_search_index(then=lambda: self._show_search_results(query))
+
+    def _show_search_results(self, query):
+        hits = [doc_id for doc_id, _ in self._search_index.search(query, limit=200)]
+        self.search_results_model.set_keys(hits)
+        self.history_tabs.setTabText(2, f"Search Results ({len(hits)})")
+        self.history_tabs.setCurrentIndex(2)
+
+    def read_search_hit(self, doc_id):
+        kind, key = doc_id.split(":", 1)
+        if kind == "daily":
+            return self.storage.read_daily(key)
+        return self.storage.read_weekly(key)
+
+    @instrumented
+    def _list_history_keys(self):
+        return self.storage.list_daily(), self.storage.list_weekly()
+
+    @instrumented(name="load_history_apply")
+    def _apply_history_keys(self, keys):
+        daily_keys, weekly_keys = keys
+        self.daily_history_model.set_keys(daily_keys)
+        self.weekly_history_model.set_keys(weekly_keys)
+
+    def patch_history(self, kind, key, content):
+        """Show a saved entry in the History tab without reloading it"""
+        # The models only exist once the History tab has been built
+        if self.tab_history not in self.built_tabs:
+            return
+        model = self.daily_history_model if kind == "daily" else self.weekly_history_model
+        model.upsert(key, content)
 
-            # Update daily chart
-            if daily_dates and daily_scores:
-                self.ax_daily.plot(
-                    daily_dates,
-                    daily_scores,
-                    marker="o",
-                    color="cyan",
-                    label="Daily Score",
-                    linestyle="-",
-                    linewidth=2,
-                )
-                self.ax_daily.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))
-                self.ax_daily.tick_params(axis="x", rotation=45)
-                self.ax_daily.set_title("Daily Progress")
-                self.ax_daily.set_ylabel("Score")
-                self.ax_daily.legend(loc="upper left")
-                self.ax_daily.grid(True, linestyle='--', alpha=0.7)
-                self.fig_daily.tight_layout()
-            else:
-                self.ax_daily.text(0.5, 0.5, 'No daily data available',
-                                 ha='center', va='center', fontsize=12)
-
-            # Update weekly chart
-            if weekly_data:
-                sorted_weeks = sorted(weekly_data.keys())
-                week_labels = [f"{year}-W{week:02d}" for year, week in sorted_weeks]
-                week_scores = [weekly_data[(year, week)] for year, week in sorted_weeks]
-
-                self.ax_weekly.plot(
-                    week_labels,
-                    week_scores,
-                    marker="s",
-                    color="orange",
-                    label="Weekly Score",
-                    linestyle="-",
-                    linewidth=2,
-                )
-                self.ax_weekly.tick_params(axis="x", rotation=45)
-                self.ax_weekly.set_title("Weekly Progress")
-                self.ax_weekly.set_ylabel("Score")
-                self.ax_weekly.legend(loc="upper left")
-                self.ax_weekly.grid(True, linestyle='--', alpha=0.7)
-                self.fig_weekly.tight_layout()
-            else:
-                self.ax_weekly.text(0.5, 0.5, 'No weekly data available',
-                                   ha='center', va='center', fontsize=12)
+    def update_chart(self):
+        """Update progress charts, or mark them dirty while the tab is hidden"""
+        if not self.tab_chart.isVisible():
+            self.chart_dirty = True
+            return
 
-            self.canvas_daily.draw()
-            self.canvas_weekly.draw()
+        self.chart_dirty = False
+        self.chart_loader.load()
+
+    @instrumented(name="update_chart")
+    def _read_chart_series(self):
+        """Read the chart series from the score index and fingerprint them"""
+        daily_series = self.storage.scores.daily_series()
+        weekly_series = self.storage.scores.weekly_series()
+        series = {
+            "daily_dates": [date for date, _ in daily_series],
+            "daily_y": [score for _, score in daily_series],
+            "week_labels": [f"{year}-W{week:02d}" for (year, week), _ in weekly_series],
+            "weekly_y": [score for _, score in weekly_series],
+        }
+        series["daily_fingerprint"] = fingerprint(series["daily_dates"], series["daily_y"])
+        series["weekly_fingerprint"] = fingerprint(series["week_labels"], series["weekly_y"])
+        return series
 
+    @instrumented(name="update_chart_apply")
+    def _apply_chart_series(self, series):
+        try:
+            self.daily_chart.set_series(
+                series["daily_fingerprint"], series["daily_dates"], series["daily_y"]
+            )
+            self.week_labels = series["week_labels"]
+            self.weekly_chart.set_series(
+                series["weekly_fingerprint"], list(range(len(self.week_labels))),
+                series["weekly_y"],
+            )
         except Exception as e:
             QMessageBox.critical(self, "Chart Error", f"Failed to update chart: {str(e)}")
 
+    def update_stats(self):
+        """Refresh the Stats tab, or mark it dirty while it is hidden"""
+        if not self.tab_stats.isVisible():
+            self.stats_dirty = True
+            return
+
+        self.stats_dirty = False
+        self.stats_loader.load()
+
+    @instrumented(name="update_stats")
+    def _read_stats(self):
+        # Only scans the todo files the first time or when they changed elsewhere
+        self.analytics.ensure_current(self.storage)
+        return self.analytics.summary(datetime.date.today())
+
+    @instrumented(name="update_stats_apply")
+    def _apply_stats(self, summary):
+        def average(value):
+            return "-" if value is None else f"{value:.2f}"
+
+        self.stats_labels["current_streak"].setText(
+            f"Current streak: {summary['current_streak']} days")
+        self.stats_labels["longest_streak"].setText(
+            f"Longest streak: {summary['longest_streak']} days")
+        self.stats_labels["average_7"].setText(
+            f"7-day average: {average(summary['average_7'])} tasks/day")
+        self.stats_labels["average_30"].setText(
+            f"30-day average: {average(summary['average_30'])} tasks/day")
+        self.stats_labels["days_tracked"].setText(
+            f"Days tracked: {summary['days_tracked']}")
+
+        rows = summary["tasks"]
+        self.task_rates_table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = [row["task"], str(row["done"]), str(row["listed"]),
+                      f"{row['rate'] * 100:.0f}%"]
+            for column, value in enumerate(values):
+                self.task_rates_table.setItem(i, column, QTableWidgetItem(value))
+
+    def quit_on_signal(self, signum):
+        """Close the window, saving everything, and leave the event loop"""
+        if self.isVisible():
+            self.close()
+        QApplication.exit(128 + signum)
+
+    def closeEvent(self, event):
+        """Finish background work before the window closes"""
+        # Pool readers may still be using the storage
+        QThreadPool.globalInstance().waitForDone()
+        self.storage.close()
+        PROFILER.flush()
+        super().closeEvent(event)
+
+
+def report_startup_time(app):
+    """Print the time from process start to the first painted window and quit"""
+    elapsed = (time.perf_counter() - _START_TIME) * 1000
+    loaded = "loaded" if "matplotlib" in sys.modules else "not loaded"
+    print(f"Startup: {elapsed:.0f} ms (matplotlib {loaded})")
+    app.quit()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = TaskManagerApp()
+    if "--eager-tabs" in sys.argv:
+        window.build_all_tabs()
     window.show()
+    if "--startup-time" in sys.argv:
+        QTimer.singleShot(0, lambda: report_startup_time(app))
     sys.exit(app.exec())
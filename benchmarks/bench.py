@@ -0,0 +1,243 @@
+"""Headless benchmarks for the app's load/save/history/chart hot paths.
+
+For each data size this generates a synthetic task_data/ directory, opens
+TaskManagerApp on the offscreen Qt platform and times each operation.
+Timings are medians over --repeat runs. Peak memory is the Python heap peak
+(tracemalloc) of one extra run. Results are written as JSON so two versions
+can be compared:
+
+    python benchmarks/bench.py --years 1 5 10
+    python benchmarks/bench.py --years 1 5 10 --compare benchmarks/results/old.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from datagen import generate  # noqa: E402
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(op, repeat, setup=None):
+    """Return timing and peak-memory stats for a zero-argument callable.
+
+    ``setup`` runs untimed before each call, e.g. to give a save something
+    to write.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        op()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def measure_startup(work_dir, repeat):
+    """Cold start of a fresh interpreter, as reported by --startup-time"""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.join(REPO_DIR, "TaskManager.py"), "--startup-time"],
+            cwd=work_dir, capture_output=True, text=True, timeout=120,
+        )
+        for line in result.stdout.splitlines():
+            if line.startswith("Startup:"):
+                timings.append(float(line.split()[1]))
+    if not timings:
+        return {"error": "no startup time reported"}
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def bench_size(app, years, repeat):
+    from PyQt6.QtCore import QThreadPool, Qt
+    import TaskManager
+
+    work_dir = tempfile.mkdtemp(prefix=f"taskbench-{years}y-")
+    data_dir = os.path.join(work_dir, "task_data")
+    try:
+        files = generate(data_dir, years)
+        results = {"files": files, "ops": {}}
+        results["ops"]["startup"] = measure_startup(work_dir, repeat)
+
+        old_cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            window = TaskManager.TaskManagerApp()
+            window.show()
+
+            def settle():
+                QThreadPool.globalInstance().waitForDone()
+                app.processEvents()
+
+            settle()
+
+            # Loads finish on the pool, so each timing includes applying the result
+            ops = results["ops"]
+            ops["load_tasks"] = measure(lambda: (window.load_tasks(), settle()), repeat)
+
+            # Saves of unchanged data write nothing, so each timed save
+            # follows a checkbox change: a journal record and a score row
+            def toggle_task():
+                model = window.todo_model
+                index = model.index(0, 0)
+                checked = model.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+                model.setData(index, (Qt.CheckState.Unchecked if checked
+                                      else Qt.CheckState.Checked).value,
+                              Qt.ItemDataRole.CheckStateRole)
+
+            ops["save_tasks"] = measure(window.save_tasks, repeat, setup=toggle_task)
+            ops["flush"] = measure(lambda: (window.save_tasks(), window.storage.flush()), repeat,
+                                   setup=toggle_task)
+
+            window.tab_widget.setCurrentWidget(window.tab_progress)
+            settle()
+            ops["save_progress"] = measure(window.save_progress, repeat,
+                                           setup=lambda: window.weekly_checkboxes[0].toggle())
+
+            window.tab_widget.setCurrentWidget(window.tab_history)
+            settle()
+            model = window.daily_history_model
+
+            def load_history():
+                window.load_history()
+                # Wait for the key listing and the first page of entries
+                for _ in range(500):
+                    settle()
+                    if not model._requested and not model._load_scheduled:
+                        break
+
+            ops["load_history"] = measure(load_history, repeat)
+
+            window.tab_widget.setCurrentWidget(window.tab_chart)
+            settle()
+
+            def update_chart():
+                window.update_chart()
+                settle()
+
+            ops["update_chart"] = measure(update_chart, repeat)
+
+            def full_chart_render():
+                window.daily_chart.ensure_live().canvas.draw()
+                window.weekly_chart.ensure_live().canvas.draw()
+
+            ops["chart_full_render"] = measure(full_chart_render, repeat)
+
+            window.close()
+            app.processEvents()
+        finally:
+            os.chdir(old_cwd)
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(current, baseline):
+    """Print each operation's median next to a previous run's"""
+    print(f"\n{'size':>6} {'operation':<18} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for size, result in current["results"].items():
+        before_ops = baseline["results"].get(size, {}).get("ops", {})
+        for op, stats in result["ops"].items():
+            before = before_ops.get(op, {}).get("median_ms")
+            after = stats.get("median_ms")
+            if before is None or after is None:
+                continue
+            ratio = after / before if before else float("inf")
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"{size:>6} {op:<18} {before:>10.2f} {after:>10.2f} {ratio:>6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 3, 10],
+                        help="history sizes to generate, in years")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<time>-<rev>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+
+    app = QApplication([])
+    # Success dialogs would block the run
+    QMessageBox.information = lambda *a, **k: None
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    for years in args.years:
+        size = f"{years:g}y"
+        print(f"Benchmarking {size}...", flush=True)
+        result = bench_size(app, years, args.repeat)
+        report["results"][size] = result
+        print(f"  {result['files']} files")
+        for op, stats in result["ops"].items():
+            extra = f", peak {stats['peak_kb']} KB" if "peak_kb" in stats else ""
+            print(f"  {op:<18} {stats.get('median_ms', float('nan')):>9.2f} ms{extra}")
+
+    output = args.output or os.path.join(
+        BENCH_DIR, "results",
+        f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{revision}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
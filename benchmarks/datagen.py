@@ -0,0 +1,85 @@
+"""Synthetic task_data/ generator for the benchmarks."""
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskcore import FileStorage  # noqa: E402
+from taskcore.formats import format_daily_log, format_weekly_review  # noqa: E402
+
+WORDS = (
+    "python data structures algorithms graphs trees sorting hashing networks "
+    "databases sql queries async threads memory cache review plan focus habit "
+    "exercise reading writing testing refactor deploy design interview notes"
+).split()
+
+TASKS = [
+    "Review daily goals", "Complete priority tasks", "Learning session",
+    "Exercise", "Plan next day", "Read 20 pages", "Inbox zero", "Practice",
+]
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(data_dir, years, seed=0, end=None):
+    """Fill ``data_dir`` with ``years`` of history ending yesterday.
+
+    Every day gets a todo file and a score row, about 70% of days get a
+    daily log, and every ISO week gets a weekly review and a score row.
+    Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.date.today() - datetime.timedelta(days=1)
+    start = end - datetime.timedelta(days=int(365 * years) - 1)
+
+    storage = FileStorage(data_dir)
+    storage.write_custom_tasks(TASKS)
+    storage.write_learning([(f"Topic {i}", rng.random() < 0.5) for i in range(40)])
+    storage.write_progress([(f"Week {i + 1}", rng.random() < 0.5) for i in range(13)])
+
+    files = 3
+    weeks = set()
+    day = start
+    while day <= end:
+        date_str = day.isoformat()
+        tasks = [(task, rng.random() < 0.6) for task in TASKS]
+        storage.write_todo(date_str, tasks)
+        storage.scores.upsert(date_str, sum(done for _, done in tasks))
+        files += 1
+
+        if rng.random() < 0.7:
+            storage.write_daily(date_str, format_daily_log(
+                date_str, sentence(rng, 3), sentence(rng, 40),
+                sentence(rng, 8), sentence(rng, 20),
+            ))
+            files += 1
+
+        year, week, _ = day.isocalendar()
+        week_id = f"{year}-W{week:02d}"
+        if week_id not in weeks:
+            weeks.add(week_id)
+            storage.write_weekly(week_id, format_weekly_review(
+                week_id, sentence(rng, 30), sentence(rng, 15), sentence(rng, 15),
+            ))
+            storage.scores.upsert(week_id, rng.randint(0, 13))
+            files += 1
+
+        day += datetime.timedelta(days=1)
+
+    storage.close()
+    return files
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("data_dir")
+    parser.add_argument("--years", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(f"Wrote {generate(args.data_dir, args.years, args.seed)} files")
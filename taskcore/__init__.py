@@ -0,0 +1,5 @@
+"""Qt-free data layer for the Task Manager app."""
+from .score_store import ScoreStore, parse_score_key
+from .storage import FileStorage, Storage, open_storage
+
+__all__ = ["FileStorage", "ScoreStore", "Storage", "open_storage", "parse_score_key"]
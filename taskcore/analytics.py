@@ -0,0 +1,264 @@
+"""Streaks, rolling averages and per-task completion rates.
+
+Nothing here rescans history on each view. Daily scores go into prefix-sum
+arrays that a save at the end of the series updates in O(1). Per-task
+counters are kept in task_stats.json and adjusted by the difference
+between a day's old and new list on every save. Only a missing or stale
+task_stats.json triggers a scan of every todo file.
+"""
+import contextlib
+import datetime
+import json
+import os
+import threading
+
+from .persistence import make_temp
+
+
+class DailyAggregates:
+    """Prefix sums and completion runs over the daily score series.
+
+    ``scores`` has one slot per calendar day from ``start``; None means
+    nothing was saved that day. A day counts towards a streak when at least
+    one task was completed.
+    """
+
+    def __init__(self, series=()):
+        self._reset(series)
+
+    def _reset(self, series):
+        self.start = None
+        self.scores = []
+        self.prefix_sum = [0]  # prefix_sum[i] == sum of the scores before day i
+        self.prefix_days = [0]  # likewise for the number of days with a score
+        self.longest = 0
+        for date, score in series:
+            self.set(date, score)
+
+    def _index(self, date):
+        return (date - self.start).days
+
+    def _completed(self, i):
+        return 0 <= i < len(self.scores) and (self.scores[i] or 0) > 0
+
+    def _run_through(self, i):
+        """Length of the completion run containing day i"""
+        left = i
+        while self._completed(left - 1):
+            left -= 1
+        right = i
+        while self._completed(right + 1):
+            right += 1
+        return right - left + 1
+
+    def _recompute_longest(self):
+        self.longest = run = 0
+        for score in self.scores:
+            run = run + 1 if (score or 0) > 0 else 0
+            self.longest = max(self.longest, run)
+
+    def set(self, date, score):
+        """Record a day's score; O(1) when the day is at the end of the series"""
+        if self.start is None:
+            self.start = date
+        elif date < self.start:
+            # Rare: a day before the first one. Rebuild with the new origin.
+            days = [(self.start + datetime.timedelta(days=i), s)
+                    for i, s in enumerate(self.scores) if s is not None]
+            self._reset([(date, score)] + days)
+            return
+
+        i = self._index(date)
+        if i >= len(self.scores):
+            missing = i + 1 - len(self.scores)
+            self.scores.extend([None] * missing)
+            self.prefix_sum.extend([self.prefix_sum[-1]] * missing)
+            self.prefix_days.extend([self.prefix_days[-1]] * missing)
+
+        was_completed = self._completed(i)
+        old = self.scores[i]
+        self.scores[i] = score
+        sum_delta = score - (old or 0)
+        days_delta = 0 if old is not None else 1
+        if sum_delta or days_delta:
+            for j in range(i + 1, len(self.prefix_sum)):
+                self.prefix_sum[j] += sum_delta
+                self.prefix_days[j] += days_delta
+
+        if score > 0 and not was_completed:
+            self.longest = max(self.longest, self._run_through(i))
+        elif was_completed and score <= 0:
+            self._recompute_longest()
+
+    def current_streak(self, today):
+        """Completion run ending today, or yesterday if today has none yet"""
+        if self.start is None:
+            return 0
+        i = self._index(today)
+        if not self._completed(i):
+            i -= 1
+        streak = 0
+        while self._completed(i):
+            streak += 1
+            i -= 1
+        return streak
+
+    def rolling_average(self, today, days):
+        """Average score over the saved days among the ``days`` ending today"""
+        if self.start is None:
+            return None
+        end = min(self._index(today) + 1, len(self.scores))
+        begin = max(self._index(today) - days + 1, 0)
+        if end <= begin:
+            return None
+        saved = self.prefix_days[end] - self.prefix_days[begin]
+        if not saved:
+            return None
+        return (self.prefix_sum[end] - self.prefix_sum[begin]) / saved
+
+
+class Analytics:
+    """Incrementally maintained completion statistics for one data directory"""
+
+    def __init__(self, data_dir):
+        self.path = os.path.join(data_dir, "task_stats.json")
+        self._lock = threading.RLock()
+        self.task_counts = {}  # task text -> [days done, days listed]
+        self.todo_days = 0
+        self.loaded = False  # counters exist and are kept up to date
+        self.daily = None  # DailyAggregates, built on first use
+        self._rebuilding = False
+        self._touched = set()
+        self._signature = None  # (mtime_ns, size) of task_stats.json as last read or written
+        self._load()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+                stat = os.fstat(f.fileno())
+            self._signature = stat.st_mtime_ns, stat.st_size
+            self.task_counts = {text: list(counts) for text, counts in state["tasks"].items()}
+            self.todo_days = state["todo_days"]
+            self.loaded = True
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error reading task stats, they will be rebuilt: {e}")
+
+    def _save(self):
+        fd, tmp_path = make_temp(self.path)
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "todo_days": self.todo_days, "tasks": self.task_counts}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self._signature = self._file_signature()
+
+    @staticmethod
+    def _apply(counts, tasks, sign):
+        for text, done in tasks or ():
+            entry = counts.setdefault(text, [0, 0])
+            entry[0] += sign * int(done)
+            entry[1] += sign
+            if entry[1] <= 0:
+                del counts[text]
+
+    def record_day(self, date_str, previous, tasks):
+        """Replace a day's contribution after its list was saved"""
+        with self._lock:
+            if self._rebuilding:
+                self._touched.add(date_str)
+                return
+            if not self.loaded:
+                return  # the first ensure_current() scans everything
+            if self._file_signature() != self._signature:
+                # Another process saved its counters; adjust those instead
+                self._load()
+            self._apply(self.task_counts, previous, -1)
+            self._apply(self.task_counts, tasks, 1)
+            if previous is None:
+                self.todo_days += 1
+            self._save()
+
+    def record_score(self, date_str, score):
+        with self._lock:
+            if self.daily is not None:
+                self.daily.set(datetime.date.fromisoformat(date_str), score)
+
+    def rebuild(self, storage):
+        """Count every todo file from scratch"""
+        with self._lock:
+            self._rebuilding = True
+            self._touched = set()
+        try:
+            counts = {}
+            scanned = {}
+            dates = storage.list_todo_dates()
+            for date_str in dates:
+                tasks = storage.read_todo(date_str)
+                scanned[date_str] = tasks
+                self._apply(counts, tasks, 1)
+
+            with self._lock:
+                # Days saved during the scan may have been read before the save
+                for date_str in self._touched:
+                    current = storage.read_todo(date_str)
+                    self._apply(counts, scanned.get(date_str), -1)
+                    self._apply(counts, current, 1)
+                    if date_str not in scanned and current is not None:
+                        dates.append(date_str)
+                self.task_counts = counts
+                self.todo_days = len(dates)
+                self.loaded = True
+                self._save()
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._touched = set()
+
+    def invalidate(self, tasks=False, scores=False):
+        """Forget counters or score aggregates after files changed elsewhere"""
+        with self._lock:
+            if tasks:
+                self.loaded = False
+            if scores:
+                self.daily = None
+
+    def ensure_current(self, storage):
+        """Load what is missing and rescan if todo files changed behind our back"""
+        if not self.loaded or self.todo_days != len(storage.list_todo_dates()):
+            self.rebuild(storage)
+        with self._lock:
+            if self.daily is None:
+                self.daily = DailyAggregates(storage.scores.daily_series())
+
+    def summary(self, today=None):
+        """Return streaks, rolling averages and per-task rates, most listed first"""
+        today = today or datetime.date.today()
+        with self._lock:
+            daily = self.daily or DailyAggregates()
+            tasks = [
+                {"task": text, "done": done, "listed": listed, "rate": done / listed}
+                for text, (done, listed) in self.task_counts.items()
+            ]
+            tasks.sort(key=lambda row: (-row["listed"], row["task"]))
+            return {
+                "current_streak": daily.current_streak(today),
+                "longest_streak": daily.longest,
+                "average_7": daily.rolling_average(today, 7),
+                "average_30": daily.rolling_average(today, 30),
+                "days_tracked": daily.prefix_days[-1],
+                "todo_days": self.todo_days,
+                "tasks": tasks,
+            }
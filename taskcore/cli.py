@@ -0,0 +1,234 @@
+"""Command-line access to the task data, without Qt or matplotlib.
+
+    python -m taskcore list
+    python -m taskcore add "Read chapter 3" "Write notes"
+    python -m taskcore check 2 "Write notes"
+    python -m taskcore log --topic "SQL joins" --takeaways "..."
+    python -m taskcore review --week 12 --summary "..."
+    python -m taskcore score 2024-03-01 4
+    python -m taskcore stats
+    python -m taskcore archive
+
+Commands work on today's list unless --date is given, and read and write
+the same task_data/ files as the GUI.
+"""
+import argparse
+import datetime
+import sys
+
+from .analytics import Analytics
+from .formats import DATE_RE, format_daily_log, format_weekly_review
+from .score_store import parse_score_key
+from .search_index import append_update
+from .storage import open_storage
+from .tasks import (
+    read_day_tasks, review_week_id, save_day_tasks, validate_log_date,
+)
+
+
+class CommandError(Exception):
+    """A problem with the user's input, reported without a traceback"""
+
+
+def print_tasks(tasks):
+    if not tasks:
+        print("No tasks")
+    for number, (text, done) in enumerate(tasks, 1):
+        print(f"{number:>3}. [{'x' if done else ' '}] {text}")
+
+
+def cmd_list(storage, args):
+    tasks, _ = read_day_tasks(storage, args.date)
+    print_tasks(tasks)
+
+
+def cmd_add(storage, args):
+    tasks, new_day = read_day_tasks(storage, args.date)
+    base = None if new_day else list(tasks)
+    existing = {text for text, _ in tasks}
+    added = 0
+    for text in args.tasks:
+        text = text.strip()
+        if text and text not in existing:
+            tasks.append((text, False))
+            existing.add(text)
+            added += 1
+    save_day_tasks(storage, args.date, tasks, Analytics(args.data_dir), base=base)
+    print(f"Added {added} task{'s' if added != 1 else ''}")
+
+
+def find_task(tasks, ref):
+    """Return the row for a 1-based task number or an exact task text"""
+    if ref.isdigit() and 1 <= int(ref) <= len(tasks):
+        return int(ref) - 1
+    for row, (text, _) in enumerate(tasks):
+        if text == ref:
+            return row
+    raise CommandError(f"No task {ref!r}")
+
+
+def cmd_check(storage, args):
+    tasks, new_day = read_day_tasks(storage, args.date)
+    base = None if new_day else list(tasks)
+    for ref in args.tasks:
+        row = find_task(tasks, ref)
+        tasks[row] = (tasks[row][0], not args.undo)
+    tasks = save_day_tasks(storage, args.date, tasks, Analytics(args.data_dir), base=base)
+    print_tasks(tasks)
+
+
+def cmd_log(storage, args):
+    error = validate_log_date(args.date)
+    if error:
+        raise CommandError(error)
+    content = format_daily_log(args.date, args.topic, args.takeaways,
+                               args.questions, args.reflection)
+    storage.write_daily(args.date, content)
+    print(f"Daily log saved for {args.date}")
+
+
+def cmd_review(storage, args):
+    try:
+        week_id = review_week_id(args.week, datetime.date.today().year)
+    except ValueError:
+        raise CommandError("Week number must be between 1-52")
+    content = format_weekly_review(week_id, args.summary, args.challenges, args.plans)
+    storage.write_weekly(week_id, content)
+    print(f"Weekly review saved for {week_id}")
+
+
+def cmd_score(storage, args):
+    kind, _ = parse_score_key(args.key)
+    if kind is None:
+        raise CommandError("Score key must be YYYY-MM-DD or YYYY-WNN")
+    storage.scores.upsert(args.key, args.score)
+    print(f"{args.key},{args.score}")
+
+
+def cmd_stats(storage, args):
+    tasks, _ = read_day_tasks(storage, args.date)
+    done = sum(1 for _, checked in tasks if checked)
+    print(f"Tasks on {args.date}: {done}/{len(tasks)} done")
+
+    analytics = Analytics(args.data_dir)
+    analytics.ensure_current(storage)
+    summary = analytics.summary(datetime.date.fromisoformat(args.date))
+    print(f"Days tracked: {summary['days_tracked']}")
+    print(f"Current streak: {summary['current_streak']} days, "
+          f"longest: {summary['longest_streak']} days")
+    for days in (7, 30):
+        average = summary[f"average_{days}"]
+        if average is not None:
+            print(f"{days}-day average: {average:.2f} tasks/day")
+
+    weekly = storage.scores.weekly_series()
+    if weekly:
+        print(f"Weeks tracked: {len(weekly)}, "
+              f"average {sum(score for _, score in weekly) / len(weekly):.2f}")
+    print(f"Daily logs: {len(storage.list_daily())}")
+    print(f"Weekly reviews: {len(storage.list_weekly())}")
+
+    if summary["tasks"]:
+        print("Completion rate per task:")
+        for row in summary["tasks"][:args.top]:
+            print(f"  {row['rate'] * 100:>4.0f}%  {row['done']:>5}/{row['listed']:<5} {row['task']}")
+
+
+def cmd_export(storage, args):
+    from .export import export_data
+
+    count = export_data(storage, args.output, args.format)
+    print(f"Wrote {count} records to {args.output}")
+
+
+def cmd_archive(storage, args):
+    archived = storage.archive_closed_months(datetime.date.fromisoformat(args.date))
+    print(f"Archived {archived} day{'s' if archived != 1 else ''}")
+
+
+def date_arg(value):
+    if not DATE_RE.match(value):
+        raise argparse.ArgumentTypeError("use YYYY-MM-DD")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m taskcore", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    # Accepted after any command, e.g. "list --date 2024-03-01"
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default="task_data")
+    common.add_argument("--backend", choices=("files", "sqlite"),
+                        help="storage backend (default: $TASKMANAGER_STORAGE or files)")
+    common.add_argument("--date", type=date_arg, default=datetime.date.today().isoformat(),
+                        help="day to work on (default: today)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_ = commands.add_parser("list", parents=[common], help="show the day's tasks")
+    list_.set_defaults(run=cmd_list)
+
+    add = commands.add_parser("add", parents=[common], help="add tasks to the day's list")
+    add.add_argument("tasks", nargs="+")
+    add.set_defaults(run=cmd_add)
+
+    check = commands.add_parser("check", parents=[common],
+                                help="check tasks by number or text")
+    check.add_argument("tasks", nargs="+")
+    check.add_argument("--undo", action="store_true", help="uncheck instead")
+    check.set_defaults(run=cmd_check)
+
+    log = commands.add_parser("log", parents=[common], help="record a daily log for --date")
+    log.add_argument("--topic", required=True)
+    log.add_argument("--takeaways", default="")
+    log.add_argument("--questions", default="")
+    log.add_argument("--reflection", default="")
+    log.set_defaults(run=cmd_log)
+
+    review = commands.add_parser("review", parents=[common], help="record a weekly review")
+    review.add_argument("--week", type=int, default=datetime.date.today().isocalendar()[1])
+    review.add_argument("--summary", default="")
+    review.add_argument("--challenges", default="")
+    review.add_argument("--plans", default="")
+    review.set_defaults(run=cmd_review)
+
+    score = commands.add_parser("score", parents=[common],
+                                help="set the score for a day or week")
+    score.add_argument("key", help="YYYY-MM-DD or YYYY-WNN")
+    score.add_argument("score", type=int)
+    score.set_defaults(run=cmd_score)
+
+    stats = commands.add_parser("stats", parents=[common],
+                                help="print score and history totals")
+    stats.add_argument("--top", type=int, default=10,
+                       help="number of tasks to list completion rates for")
+    stats.set_defaults(run=cmd_stats)
+
+    export = commands.add_parser("export", parents=[common],
+                                 help="write all data as JSON Lines or CSV")
+    export.add_argument("output")
+    export.add_argument("--format", choices=("jsonl", "csv"))
+    export.set_defaults(run=cmd_export)
+
+    archive = commands.add_parser("archive", parents=[common],
+                                  help="pack task lists of months before --date")
+    archive.set_defaults(run=cmd_archive)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    storage = open_storage(args.data_dir, backend=args.backend)
+    # Keep the GUI's search index current without loading it here
+    storage.add_save_hook(
+        lambda kind, key, content: append_update(args.data_dir, kind, key, content)
+    )
+    try:
+        args.run(storage, args)
+    except CommandError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.close()
+    return 0
@@ -0,0 +1,44 @@
+"""Shape-preserving downsampling for chart series."""
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of ``threshold - 2``
+    buckets in between, the point that forms the largest triangle with the
+    previously kept point and the average of the next bucket. Peaks and dips
+    survive, so the line looks the same at screen resolution.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        count = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / count
+        avg_y = sum(ys[avg_start:avg_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best = -1.0
+        next_a = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                next_a = j
+
+        out_x.append(xs[next_a])
+        out_y.append(ys[next_a])
+        a = next_a
+
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
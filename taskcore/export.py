@@ -0,0 +1,183 @@
+"""Streaming export of everything in a storage backend to JSON Lines or CSV.
+
+Records are produced by a chain of generators, so only one file's content
+is held at a time no matter how much history there is:
+
+    sources -> records -> (CSV rows) -> output file
+
+Each record is a flat dict with a ``type`` (goal_date, custom_task,
+learning_task, progress, todo, daily_log, weekly_review or score) and the
+columns that apply to it. Daily logs and weekly reviews carry their
+sections under ``fields``; in CSV they become one row per section.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from .formats import DAILY_FIELDS, WEEKLY_FIELDS, parse_entry
+from .search_index import FIELDS
+
+FORMATS = ("jsonl", "csv")
+CSV_COLUMNS = ["type", "key", "position", "field", "text", "done", "score"]
+
+
+def plan_sources(storage):
+    """Snapshot the keys to export, in export order.
+
+    Returns (kind, key) pairs; only keys are listed here, contents are read
+    one at a time by iter_records().
+    """
+    sources = [("goal_date", None), ("custom_task", None),
+               ("learning_task", None), ("progress", None)]
+    sources += [("todo", date) for date in storage.list_todo_dates()]
+    sources += [("daily_log", date) for date in reversed(storage.list_daily())]
+    sources += [("weekly_review", week_id) for week_id in reversed(storage.list_weekly())]
+    sources.append(("score", None))
+    return sources
+
+
+def _task_records(kind, tasks, key=None):
+    for position, (text, done) in enumerate(tasks or []):
+        record = {"type": kind, "position": position, "text": text, "done": done}
+        if key is not None:
+            record["key"] = key
+        yield record
+
+
+def _entry_record(kind, key, content, fields):
+    sections = parse_entry(content, fields)
+    names = FIELDS["daily" if kind == "daily_log" else "weekly"]
+    return {
+        "type": kind,
+        "key": key,
+        "fields": {name: sections.get(section, "") for section, name in names.items()},
+    }
+
+
+def read_source(storage, kind, key):
+    """Yield the records stored under one source"""
+    if kind == "goal_date":
+        goal_date = storage.read_goal_date()
+        if goal_date:
+            yield {"type": kind, "key": goal_date}
+    elif kind == "custom_task":
+        for position, text in enumerate(storage.read_custom_tasks() or []):
+            yield {"type": kind, "position": position, "text": text}
+    elif kind == "learning_task":
+        yield from _task_records(kind, storage.read_learning())
+    elif kind == "progress":
+        yield from _task_records(kind, storage.read_progress())
+    elif kind == "todo":
+        yield from _task_records(kind, storage.read_todo(key), key)
+    elif kind == "daily_log":
+        content = storage.read_daily(key)
+        if content is not None:
+            yield _entry_record(kind, key, content, DAILY_FIELDS)
+    elif kind == "weekly_review":
+        content = storage.read_weekly(key)
+        if content is not None:
+            yield _entry_record(kind, key, content, WEEKLY_FIELDS)
+    elif kind == "score":
+        for score_key, score in storage.scores.items():
+            yield {"type": kind, "key": score_key, "score": score}
+
+
+def iter_records(storage, sources=None, progress=None):
+    """Yield every record, calling ``progress(done, total)`` after each source"""
+    if sources is None:
+        sources = plan_sources(storage)
+    total = len(sources)
+    for done, (kind, key) in enumerate(sources, 1):
+        yield from read_source(storage, kind, key)
+        if progress is not None:
+            progress(done, total)
+
+
+def csv_rows(records):
+    """Flatten records into rows of CSV_COLUMNS"""
+    for record in records:
+        if "fields" in record:
+            for field, text in record["fields"].items():
+                yield [record["type"], record["key"], "", field, text, "", ""]
+            continue
+        done = record.get("done")
+        yield [
+            record["type"],
+            record.get("key") or "",
+            record.get("position", ""),
+            "",
+            record.get("text", ""),
+            "" if done is None else int(done),
+            record.get("score", ""),
+        ]
+
+
+def export_data(storage, path, fmt=None, progress=None, cancelled=None):
+    """Write all data to ``path`` as JSON Lines or CSV.
+
+    ``fmt`` defaults to the file extension. ``cancelled`` is polled between
+    records; when it returns true the partial file is removed and None is
+    returned. Otherwise returns the number of records written. The file
+    only appears under its final name once it is complete.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    storage.flush()
+    records = iter_records(storage, progress=progress)
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "jsonl":
+                for record in records:
+                    if cancelled is not None and cancelled():
+                        return None
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(f)
+                writer.writerow(CSV_COLUMNS)
+                for row in csv_rows(records):
+                    if cancelled is not None and cancelled():
+                        return None
+                    writer.writerow(row)
+                    count += 1
+        os.replace(tmp_path, path)
+        return count
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main(argv=None):
+    from .storage import open_storage
+
+    parser = argparse.ArgumentParser(description="Export all Task Manager data")
+    parser.add_argument("output", help="file to write (.jsonl or .csv)")
+    parser.add_argument("--data-dir", default="task_data")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="output format (default: from the file extension)")
+    parser.add_argument("--backend", choices=("files", "sqlite"))
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\rExporting {done}/{total}", end="", file=sys.stderr, flush=True)
+
+    storage = open_storage(args.data_dir, backend=args.backend)
+    try:
+        count = export_data(storage, args.output, args.format, progress=progress)
+    except KeyboardInterrupt:
+        print("\nExport cancelled", file=sys.stderr)
+        return 1
+    finally:
+        storage.close()
+    print(f"\nWrote {count} records to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
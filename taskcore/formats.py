@@ -0,0 +1,66 @@
+"""Text formats shared by every storage backend."""
+import re
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+WEEK_ID_RE = re.compile(r"^\d{4}-W\d{2}$")
+
+DAILY_FIELDS = ["Date", "Topic Covered", "Key Takeaways", "Questions", "Reflection"]
+WEEKLY_FIELDS = ["Week ID", "Progress Summary", "Challenges Faced", "Next Week Plans"]
+
+
+def parse_status_lines(lines, lenient=False):
+    """Parse ``status|text`` lines into (text, done) pairs.
+
+    With ``lenient`` a line without a status is read as an unchecked task,
+    which is how learning_tasks.txt has always been read.
+    """
+    tasks = []
+    for line in lines:
+        line = line.strip()
+        parts = line.split("|", 1)
+        if len(parts) == 2:
+            value, task = parts
+        elif lenient and line:
+            value, task = "0", line
+        else:
+            continue
+        tasks.append((task, value == "1"))
+    return tasks
+
+
+def format_status_lines(tasks):
+    """Render (text, done) pairs as ``status|text`` lines"""
+    return "".join(f"{'1' if done else '0'}|{task}\n" for task, done in tasks)
+
+
+def format_entry(fields, values):
+    """Render a daily log or weekly review as ``Key: value`` lines"""
+    return "".join(f"{field}: {value}\n" for field, value in zip(fields, values))
+
+
+def format_daily_log(date_str, topic, takeaways, questions, reflection):
+    return format_entry(DAILY_FIELDS, [date_str, topic, takeaways, questions, reflection])
+
+
+def format_weekly_review(week_id, summary, challenges, plans):
+    return format_entry(WEEKLY_FIELDS, [week_id, summary, challenges, plans])
+
+
+def parse_entry(content, fields):
+    """Split ``Key: value`` text back into a {field: value} dict.
+
+    Values may span several lines; a line only starts a new field when it
+    begins with one of the known field names.
+    """
+    result = {}
+    current = None
+    for line in content.splitlines():
+        for field in fields:
+            if line.startswith(f"{field}: ") or line == f"{field}:":
+                current = field
+                result[field] = line[len(field) + 1:].lstrip(" ")
+                break
+        else:
+            if current is not None:
+                result[current] += "\n" + line
+    return result
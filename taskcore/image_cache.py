@@ -0,0 +1,75 @@
+"""Size-bounded on-disk cache for rendered chart images."""
+import contextlib
+import hashlib
+import json
+import os
+
+from .persistence import make_temp
+
+
+def fingerprint(*parts):
+    """Stable hash of JSON-serialisable data (dates are hashed as strings)"""
+    data = json.dumps(parts, default=str, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """PNG files named by key, evicted least recently used first.
+
+    A hit refreshes the file's mtime, so the mtime order is the LRU order.
+    Whenever a put() takes the directory over ``max_bytes``, the oldest
+    files are removed until it fits again.
+    """
+
+    def __init__(self, directory, max_bytes=8 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key):
+        """Return the path of a cached image, or None"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def contains(self, key):
+        return os.path.exists(self._path(key))
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, tmp_path = make_temp(path)
+        try:
+            with open(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used images until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,180 @@
+"""Opt-in timing and I/O accounting for hot paths.
+
+Set TASKMANAGER_PROFILE=1 (or call PROFILER.enable()) to turn it on. Each
+call to an @instrumented function then records its wall time, the bytes it
+read and wrote and the files it touched. Records go to a rolling JSON-lines
+file and into per-operation histories used for the p50/p95 summary.
+"""
+import atexit
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+CO_VARARGS = 0x04  # code flag for a *args parameter
+
+
+class Profiler:
+    HISTORY = 1000  # durations kept per operation for percentiles
+    BUFFER = 50  # records buffered before the metrics file is appended
+
+    def __init__(self):
+        self.enabled = os.environ.get("TASKMANAGER_PROFILE") == "1"
+        self.metrics_path = None
+        self.max_bytes = 1024 * 1024
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._history = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.HISTORY)
+        )
+        self._totals = collections.defaultdict(lambda: [0, 0, 0])  # calls, read, written
+        self._buffer = []
+        atexit.register(self.flush)
+
+    def configure(self, metrics_path, max_bytes=None):
+        self.metrics_path = metrics_path
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.flush()
+        self.enabled = False
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_read(self, path, data):
+        """Charge a read to every instrumented call running on this thread"""
+        if self.enabled:
+            self._charge(path, data, "bytes_read")
+
+    def record_write(self, path, data):
+        if self.enabled:
+            self._charge(path, data, "bytes_written")
+
+    def _charge(self, path, data, field):
+        stack = self._stack()
+        if not stack:
+            return
+        size = len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+        for call in stack:
+            call[field] += size
+            call["files"].add(os.path.basename(path))
+
+    def call(self, op, fn, *args, **kwargs):
+        call = {"bytes_read": 0, "bytes_written": 0, "files": set()}
+        stack = self._stack()
+        stack.append(call)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stack.pop()
+            self._finish(op, elapsed, call)
+
+    def _finish(self, op, elapsed, call):
+        record = {
+            "ts": round(time.time(), 3),
+            "op": op,
+            "ms": round(elapsed, 3),
+            "bytes_read": call["bytes_read"],
+            "bytes_written": call["bytes_written"],
+            "files": sorted(call["files"]),
+        }
+        with self._lock:
+            self._history[op].append(elapsed)
+            totals = self._totals[op]
+            totals[0] += 1
+            totals[1] += call["bytes_read"]
+            totals[2] += call["bytes_written"]
+            self._buffer.append(record)
+            should_flush = len(self._buffer) >= self.BUFFER
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Append buffered records to the metrics file, rotating it when full"""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if not records or not self.metrics_path:
+            return
+        try:
+            if (os.path.exists(self.metrics_path)
+                    and os.path.getsize(self.metrics_path) > self.max_bytes):
+                os.replace(self.metrics_path, self.metrics_path + ".1")
+            with open(self.metrics_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def summary(self):
+        """Return per-operation stats, slowest p95 first"""
+        rows = []
+        with self._lock:
+            for op, durations in self._history.items():
+                ordered = sorted(durations)
+                calls, read, written = self._totals[op]
+                rows.append({
+                    "op": op,
+                    "calls": calls,
+                    "p50_ms": percentile(ordered, 50),
+                    "p95_ms": percentile(ordered, 95),
+                    "max_ms": ordered[-1],
+                    "avg_read": read / calls,
+                    "avg_written": written / calls,
+                })
+        rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+            self._totals.clear()
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+PROFILER = Profiler()
+
+
+def instrumented(fn=None, *, name=None):
+    """Record each call of ``fn`` with PROFILER when profiling is enabled.
+
+    Extra positional arguments beyond what ``fn`` accepts are dropped, the
+    way PyQt does for slots, so decorated methods stay connectable to
+    signals such as ``clicked(bool)``.
+    """
+    if fn is None:
+        return functools.partial(instrumented, name=name)
+
+    op = name or fn.__name__
+    # Read from the code object; importing inspect would slow the CLI's start
+    code = fn.__code__
+    max_args = None if code.co_flags & CO_VARARGS else code.co_argcount
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if max_args is not None:
+            args = args[:max_args]
+        if not PROFILER.enabled:
+            return fn(*args, **kwargs)
+        return PROFILER.call(op, fn, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,202 @@
+"""Append-only edit journals for the (text, done) task list files.
+
+Instead of rewriting a whole list on every save, the difference to the
+previous list is appended to ``<name>.journal`` as JSON lines:
+
+    {"base": 1234567, "generation": "9f0c..."}   header: the base list
+    ["add", 3, [["Read", false]]]     insert tasks before row 3
+    ["delete", 1, 2]                  remove 2 rows starting at row 1
+    ["toggle", 0, true]               check or uncheck row 0
+    ["rename", 2, "Write notes"]      change the text of row 2
+
+Reading replays the records on top of the base file. A checkpoint folds
+them back by rewriting the base file and deleting the journal. Every
+checkpoint starts the file with a new random generation id
+(``# generation <id>``), which the header repeats, so a journal left
+behind by an interrupted checkpoint is recognised as stale and ignored,
+even if the rewritten file happens to hold the same tasks. The header
+checksum still catches a base file edited by hand. A torn last record,
+from a crash mid-append, ends the replay at the last complete record.
+"""
+import json
+import operator
+import os
+import uuid
+import zlib
+
+from .persistence import WRITER
+
+
+GENERATION_PREFIX = "# generation "
+
+
+def new_generation():
+    return uuid.uuid4().hex
+
+
+def format_generation(generation):
+    return f"{GENERATION_PREFIX}{generation}\n"
+
+
+def split_generation(content):
+    """Return (generation, rest) for a list file's text; generation is None if it has none"""
+    if not content.startswith(GENERATION_PREFIX):
+        return None, content
+    line, _, rest = content.partition("\n")
+    return line[len(GENERATION_PREFIX):].strip(), rest
+
+
+def list_checksum(tasks):
+    data = json.dumps([[text, bool(done)] for text, done in tasks], separators=(",", ":"))
+    return zlib.crc32(data.encode("utf-8"))
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix of two sequences, compared in C"""
+    differs = list(map(operator.ne, a, b))
+    try:
+        return differs.index(True)
+    except ValueError:
+        return len(differs)
+
+
+def diff_ops(old, new):
+    """Return the journal records that turn list ``old`` into ``new``"""
+    start = _common_prefix(old, new)
+    suffix = min(_common_prefix(reversed(old), reversed(new)),
+                 min(len(old), len(new)) - start)
+    old_end, new_end = len(old) - suffix, len(new) - suffix
+
+    ops = []
+    rebound = min(old_end, new_end)
+    for row in range(start, rebound):
+        (old_text, old_done), (text, done) = old[row], new[row]
+        if text != old_text:
+            ops.append(["rename", row, text])
+        if bool(done) != bool(old_done):
+            ops.append(["toggle", row, bool(done)])
+    if old_end > rebound:
+        ops.append(["delete", rebound, old_end - rebound])
+    elif new_end > rebound:
+        ops.append(["add", rebound, [[text, bool(done)] for text, done in new[rebound:new_end]]])
+    return ops
+
+
+def merge_lists(base, ours, theirs):
+    """Three-way merge of two lists edited from the same ``base``.
+
+    Tasks are matched by text. Our additions, deletions and checkbox
+    changes are applied to ``theirs``, so both sides' edits survive. New
+    tasks of ours go after the task they followed in ``ours``.
+    """
+    base_done = dict(base)
+    ours_done = dict(ours)
+    merged = []
+    for text, done in theirs:
+        if text in base_done and text not in ours_done:
+            continue  # we deleted it
+        if text in base_done and ours_done[text] != base_done[text]:
+            done = ours_done[text]
+        merged.append((text, done))
+
+    kept = {text for text, _ in merged}
+    present = set(kept)
+    added = {}  # text of the task they follow (None for the top) -> new tasks
+    anchor = None
+    for text, done in ours:
+        if text in kept:
+            anchor = text
+        elif text not in base_done and text not in present:
+            added.setdefault(anchor, []).append((text, done))
+            present.add(text)
+
+    result = added.pop(None, [])
+    for task in merged:
+        result.append(task)
+        result.extend(added.pop(task[0], ()))
+    return result
+
+
+def apply_op(tasks, op):
+    """Apply one record to a list in place; raise ValueError if it does not fit"""
+    try:
+        kind, row = op[0], op[1]
+        if not isinstance(row, int) or row < 0:
+            raise ValueError(f"bad row in {op!r}")
+        if kind == "add" and row <= len(tasks):
+            tasks[row:row] = [(str(text), bool(done)) for text, done in op[2]]
+        elif kind == "delete" and row + op[2] <= len(tasks):
+            del tasks[row:row + op[2]]
+        elif kind == "toggle" and row < len(tasks):
+            tasks[row] = (tasks[row][0], bool(op[2]))
+        elif kind == "rename" and row < len(tasks):
+            tasks[row] = (str(op[2]), tasks[row][1])
+        else:
+            raise ValueError(f"record does not fit the list: {op!r}")
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"malformed record {op!r}: {e}") from e
+
+
+class ListJournal:
+    """The journal file next to one task list file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def replay(self, base, generation=None, checksum=None):
+        """Return (tasks, records, clean) for the base list plus the journal.
+
+        ``generation`` is the base file's generation id (None for a file
+        written before they existed). ``checksum`` is list_checksum(base) if
+        the caller knows it already.
+
+        ``clean`` is False when the journal is stale or ends in a torn or
+        invalid record; the next save should then checkpoint.
+        """
+        tasks = list(base)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return tasks, 0, True
+
+        # A complete journal ends with a newline, leaving "" as the last item
+        complete, torn = lines[:-1], lines[-1] != ""
+        try:
+            header = json.loads(complete[0]) if complete else None
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("generation") != generation:
+            return tasks, 0, False
+        if header.get("base") != (checksum if checksum is not None else list_checksum(base)):
+            return tasks, 0, False
+
+        records = 0
+        for line in complete[1:]:
+            try:
+                apply_op(tasks, json.loads(line))
+            except ValueError as e:
+                print(f"Error replaying {self.path}, ignoring the rest: {e}")
+                return tasks, records, False
+            records += 1
+        return tasks, records, not torn
+
+    def append(self, base, ops, generation=None, checksum=None):
+        """Append records; a new journal starts with the base list's header"""
+        lines = [json.dumps(op, separators=(",", ":")) for op in ops]
+        if not os.path.exists(self.path):
+            if checksum is None:
+                checksum = list_checksum(base)
+            header = {"base": checksum, "generation": generation}
+            lines.insert(0, json.dumps(header))
+        data = "".join(line + "\n" for line in lines)
+        WRITER.append(self.path, data)
+        return data
+
+    def signature(self):
+        """(inode, mtime_ns, size) of the journal, or None if there is none"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
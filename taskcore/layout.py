@@ -0,0 +1,149 @@
+"""Year/month sharded data directory and its in-memory file index.
+
+Dated files live below the data directory instead of in it:
+
+    task_data/2024/03/todo_2024-03-01.txt    (and its .journal)
+    task_data/2024/03/daily_2024-03-01.txt
+    task_data/2024/03/todo_2024-03.pack
+    task_data/2024/weekly_2024-W09.txt
+    task_data/custom_tasks.txt               state files stay on top
+
+Files in the old flat layout are moved into place when a FileStorage
+opens the directory.
+"""
+import bisect
+import os
+import re
+import threading
+
+from .persistence import WRITER
+
+DATED_RE = re.compile(r"^(?:todo|daily)_(\d{4})-(\d{2})(?:-\d{2})?\.(?:txt|journal|pack)$")
+WEEKLY_RE = re.compile(r"^weekly_(\d{4})-W\d{2}\.txt$")
+YEAR_RE = re.compile(r"^\d{4}$")
+MONTH_RE = re.compile(r"^\d{2}$")
+
+
+def shard_of(name):
+    """Directory of a data file relative to the data directory ("" for the top)"""
+    match = DATED_RE.match(name)
+    if match:
+        return os.path.join(match.group(1), match.group(2))
+    match = WEEKLY_RE.match(name)
+    if match:
+        return match.group(1)
+    return ""
+
+
+def migrate_to_shards(data_dir):
+    """Move dated files from the top level into their shards; returns the count"""
+    moved = 0
+    with os.scandir(data_dir) as it:
+        names = [entry.name for entry in it if entry.is_file()]
+    with WRITER.group():
+        for name in names:
+            shard = shard_of(name)
+            if not shard:
+                continue
+            directory = os.path.join(data_dir, shard)
+            WRITER.makedirs(directory)
+            # A top-level file can only be newer: it was written by a
+            # version that does not know about shards
+            WRITER.move(os.path.join(data_dir, name), os.path.join(directory, name))
+            moved += 1
+    return moved
+
+
+def split_name(name):
+    """("todo", ".txt", "2024-03-01") for "todo_2024-03-01.txt" """
+    stem, ext = os.path.splitext(name)
+    prefix, _, key = stem.partition("_")
+    return prefix, ext, key
+
+
+class DirectoryIndex:
+    """Names of the data files, scanned once and then kept current by saves.
+
+    Keys are grouped by prefix and extension and kept sorted, so "the
+    newest 10 daily logs" or "does this day have a list" are answered
+    without listing any directory. refresh() rescans after changes made
+    by other processes.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._groups = None  # (prefix, ext) -> sorted keys
+
+    @staticmethod
+    def _list(directory, names, subdir_re):
+        """Add a directory's file names to ``names``; return matching subdirectories"""
+        subdirs = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if subdir_re is not None and subdir_re.match(entry.name):
+                        subdirs.append(entry.path)
+                elif not entry.name.endswith(".tmp"):
+                    names.append(entry.name)
+        return subdirs
+
+    def _scan(self):
+        names = []
+        for year_dir in self._list(self.data_dir, names, YEAR_RE):
+            for month_dir in self._list(year_dir, names, MONTH_RE):
+                self._list(month_dir, names, None)
+        groups = {}
+        for name in names:
+            prefix, ext, key = split_name(name)
+            groups.setdefault((prefix, ext), []).append(key)
+        for keys in groups.values():
+            keys.sort()
+        return groups
+
+    def _ensure(self):
+        if self._groups is None:
+            self._groups = self._scan()
+
+    def refresh(self):
+        groups = self._scan()
+        with self._lock:
+            self._groups = groups
+
+    def keys(self, prefix, ext, pattern=None, newest=None):
+        """Sorted keys of the files named ``<prefix>_<key><ext>``.
+
+        Only keys matching ``pattern`` are returned. With ``newest`` the
+        result is that many of the largest keys, largest first, found
+        without looking at the others.
+        """
+        with self._lock:
+            self._ensure()
+            keys = self._groups.get((prefix, ext), ())
+            if newest is None:
+                return [key for key in keys if pattern is None or pattern.match(key)]
+            found = []
+            for key in reversed(keys):
+                if len(found) >= newest:
+                    break
+                if pattern is None or pattern.match(key):
+                    found.append(key)
+            return found
+
+    def add(self, name):
+        prefix, ext, key = split_name(name)
+        with self._lock:
+            self._ensure()
+            keys = self._groups.setdefault((prefix, ext), [])
+            i = bisect.bisect_left(keys, key)
+            if i == len(keys) or keys[i] != key:
+                keys.insert(i, key)
+
+    def discard(self, name):
+        prefix, ext, key = split_name(name)
+        with self._lock:
+            self._ensure()
+            keys = self._groups.get((prefix, ext), [])
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
@@ -0,0 +1,140 @@
+"""Cross-process write lock and change counter for one data directory.
+
+Every process that writes to a data directory (the app, a second copy of
+it, the command line, scripts) takes the same advisory lock on
+``data.lock`` around its read-modify-write steps, so their updates are
+applied one after the other instead of on top of each other.
+
+The lock file also holds a change sequence number that each writer
+increments before releasing the lock, if it changed anything. Reading it
+is a single small read, so other processes can poll it every few seconds
+to learn that somebody else changed something.
+"""
+import os
+import threading
+
+from .persistence import WRITER
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SEQUENCE_WIDTH = 20
+# Windows locks are mandatory, so lock a byte past the sequence number
+# to keep it readable while the lock is held
+LOCK_OFFSET = 4096
+
+
+def read_sequence(path):
+    """Return the change sequence number stored in a lock file (0 if none)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(SEQUENCE_WIDTH)
+    except FileNotFoundError:
+        return 0
+    try:
+        return int(data)
+    except ValueError:
+        return 0
+
+
+class DataLock:
+    """Exclusive advisory lock on a file, shared by all processes and threads.
+
+    Use it as a context manager. It is reentrant within a thread; other
+    threads of this process wait on an in-process lock first, so only one
+    file lock is ever requested per process. An outermost release bumps
+    the change sequence number if the holding thread wrote anything
+    through WRITER (see persistence) meanwhile; read-only uses of the lock
+    and saves that turned out to change nothing leave it alone.
+
+    Only one DataLock per lock file should exist in a process: two of them
+    would wait on each other.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+        self._writes = 0  # WRITER.writes() when the file lock was taken
+        self._known = None  # last sequence number this process wrote or polled
+        self._missed = False  # somebody else wrote before our last write
+
+    def _acquire_file(self):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            return
+        os.lseek(self._fd, LOCK_OFFSET, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after 10 seconds; keep waiting
+
+    def _release_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, LOCK_OFFSET, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def _bump(self):
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        try:
+            sequence = int(os.read(self._fd, SEQUENCE_WIDTH))
+        except ValueError:
+            sequence = 0
+        if self._known is not None and sequence != self._known:
+            self._missed = True
+        self._known = sequence + 1
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        # Fixed width, so the number is overwritten in place and never torn short
+        os.write(self._fd, f"{self._known:0{SEQUENCE_WIDTH}d}\n".encode("ascii"))
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._acquire_file()
+            except BaseException:
+                self._lock.release()
+                raise
+            self._writes = WRITER.writes()
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                try:
+                    if WRITER.writes() != self._writes:
+                        self._bump()
+                finally:
+                    self._release_file()
+        finally:
+            self._lock.release()
+
+    def sequence(self):
+        return read_sequence(self.path)
+
+    def changed_elsewhere(self):
+        """Whether another process wrote since the last call or our last write"""
+        sequence = self.sequence()
+        with self._lock:
+            changed = self._missed or (self._known is not None and sequence != self._known)
+            self._known = sequence
+            self._missed = False
+            return changed
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
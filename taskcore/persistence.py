@@ -0,0 +1,313 @@
+"""Crash-safe file writes with group commit, and a write-behind queue."""
+import atexit
+import contextlib
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+from .instrumentation import instrumented
+
+
+def make_temp(path):
+    """Create an empty temp file next to ``path``; returns (fd, temp path).
+
+    The name is unique, so concurrent writers of the same file, in this
+    process or another, never write to or remove each other's temp file.
+    It ends in ".tmp" like every other temp file in the data directory.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    return tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+
+
+class AtomicWriter:
+    """Crash-safe writes whose fsyncs are batched per group.
+
+    replace() writes a temp file, fsyncs it and renames it over the
+    target, so even after a power loss the target holds either its old or
+    its complete new content, never a truncated mix. append() adds to the
+    end of a file. Inside group() the remaining syncs wait until the
+    outermost group exits; then every appended file is fsynced once,
+    followed by every directory that gained or lost an entry, which makes
+    the renames durable. Outside a group each call is its own group.
+
+    The rename happens right away so later reads in the same group see the
+    new content.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.syncs = 0
+
+    @contextlib.contextmanager
+    def group(self):
+        """Make every write in the block durable together when it ends"""
+        if getattr(self._local, "files", None) is not None:
+            yield
+            return
+        self._local.files, self._local.dirs = {}, {}
+        try:
+            yield
+        finally:
+            files, dirs = self._local.files, self._local.dirs
+            self._local.files = self._local.dirs = None
+            self._sync(files, dirs)
+
+    def writes(self):
+        """How many changes the calling thread has made so far"""
+        return getattr(self._local, "writes", 0)
+
+    def _touched(self, path, new_entry):
+        self._local.writes = self.writes() + 1
+        with self.group():
+            self._local.files[path] = None
+            if new_entry:
+                self._touched_dir(os.path.dirname(os.path.abspath(path)))
+
+    def _touched_dir(self, directory):
+        self._local.writes = self.writes() + 1
+        with self.group():
+            self._local.dirs[directory] = None
+
+    def _sync_file(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.syncs += 1
+
+    def _sync(self, files, dirs):
+        for path in files:
+            try:
+                self._sync_file(path)
+            except FileNotFoundError:
+                continue  # replaced or removed again later in the group
+        for directory in dirs:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue  # directories cannot be opened on Windows
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+            self.syncs += 1
+
+    def commit_file(self, tmp_path, path):
+        """Sync a finished temp file and rename it over ``path``"""
+        self._sync_file(tmp_path)
+        os.replace(tmp_path, path)
+        with self.group():
+            self._touched_dir(os.path.dirname(os.path.abspath(path)))
+            self._touched_dir(os.path.dirname(os.path.abspath(tmp_path)))
+
+    def move(self, src, dst):
+        """Rename a file; only the directories need syncing"""
+        os.replace(src, dst)
+        with self.group():
+            self._touched_dir(os.path.dirname(os.path.abspath(src)))
+            self._touched_dir(os.path.dirname(os.path.abspath(dst)))
+
+    def makedirs(self, directory):
+        """Create a directory and its missing parents durably"""
+        directory = os.path.abspath(directory)
+        missing = []
+        while not os.path.isdir(directory):
+            missing.append(directory)
+            directory = os.path.dirname(directory)
+        if not missing:
+            return
+        os.makedirs(missing[0], exist_ok=True)
+        with self.group():
+            for created in missing:
+                self._touched_dir(os.path.dirname(created))
+
+    def replace(self, path, content):
+        """Atomically replace a file with str or bytes content"""
+        mode, encoding = ("wb", None) if isinstance(content, bytes) else ("w", "utf-8")
+        fd, tmp_path = make_temp(path)
+        try:
+            with open(fd, mode, encoding=encoding) as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            self.syncs += 1
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self._touched_dir(os.path.dirname(os.path.abspath(path)))
+
+    def append(self, path, content, newline=None):
+        created = not os.path.exists(path)
+        with open(path, "a", encoding="utf-8", newline=newline) as f:
+            f.write(content)
+        self._touched(path, created)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._touched_dir(os.path.dirname(os.path.abspath(path)))
+
+
+WRITER = AtomicWriter()
+
+
+class WriteBehindQueue:
+    """Buffer file writes and flush them on a background thread.
+
+    Only the latest content submitted for a path is kept, so repeated saves
+    of the same file within ``delay`` seconds cost a single write. Readers
+    call pending() first so they always see the newest content. Each flushed
+    batch is committed as one WRITER group.
+
+    ``lock``, if given, is held around every batch. It must be taken before
+    the queue's own locks, so a caller holding it may flush too.
+    """
+
+    def __init__(self, write_file, delay=0.5, lock=None):
+        self.write_file = write_file
+        self.delay = delay
+        self.lock = lock if lock is not None else contextlib.nullcontext()
+
+        self._pending = {}  # path -> content
+        self._deadline = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # keeps batches in order
+        self._flushing = None  # id of the thread running a flush
+
+        self.submitted = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, content):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            self._pending[path] = content
+            self.submitted += 1
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.delay
+                self._cond.notify()
+
+    def pending(self, path):
+        """Return the unflushed content for a path, or None"""
+        with self._cond:
+            return self._pending.get(path)
+
+    def pending_paths(self):
+        with self._cond:
+            return list(self._pending)
+
+    @instrumented(name="write_behind_flush")
+    def flush(self):
+        """Write everything that is pending, on the calling thread.
+
+        A call made while the same thread is already flushing, from a signal
+        handler, returns at once: the flush under way finishes its batch
+        and anything newer stays queued for the next one.
+        """
+        if self._flushing == threading.get_ident():
+            return
+        with self._cond:
+            if not self._pending and self._flushing is None:
+                return  # nothing queued or being written; skip the locks
+        with self.lock, self._flush_lock:
+            self._flushing = threading.get_ident()
+            try:
+                self._flush_batch()
+            finally:
+                self._flushing = None
+
+    def _flush_batch(self):
+        with self._cond:
+            batch, self._pending = self._pending, {}
+            self._deadline = None
+
+        with WRITER.group():
+            for path, content in batch.items():
+                try:
+                    self.write_file(path, content)
+                    self.written += 1
+                except Exception as e:
+                    print(f"Error writing {path}: {e}")
+                    with self._cond:
+                        # Retry later unless a newer write replaced it
+                        self._pending.setdefault(path, content)
+                        if self._deadline is None and not self._closed:
+                            self._deadline = time.monotonic() + self.delay
+                            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    def close(self):
+        """Flush pending writes and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+
+def install_flush_handlers(flush, quit=None):
+    """Call ``flush`` at exit, on SIGINT/SIGTERM and on an uncaught exception.
+
+    After a signal's flush, ``quit(signum)`` is called if given. It should
+    only ask the program to stop, e.g. post a quit to an event loop: the
+    handler may run in the middle of any code on the main thread. Without
+    it the previous handler runs, or the process exits.
+    """
+    atexit.register(flush)
+
+    previous_hook = sys.excepthook
+
+    def excepthook(exc_type, exc, tb):
+        flush()
+        previous_hook(exc_type, exc, tb)
+
+    sys.excepthook = excepthook
+
+    for name in ("SIGINT", "SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        previous = signal.getsignal(signum)
+
+        def handler(signum, frame, previous=previous):
+            flush()
+            if quit is not None:
+                quit(signum)
+            elif callable(previous):
+                previous(signum, frame)
+            else:
+                sys.exit(128 + signum)
+
+        try:
+            signal.signal(signum, handler)
+        except ValueError:
+            # Not on the main thread
+            pass
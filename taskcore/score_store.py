@@ -0,0 +1,291 @@
+"""Append-only score log for task_score.csv with an in-memory index."""
+import contextlib
+import csv
+import datetime
+import os
+import threading
+
+from .instrumentation import PROFILER
+from .persistence import WRITER, make_temp
+
+
+def parse_score_key(key):
+    """Classify a score key as ("daily", date) or ("weekly", (year, week))"""
+    try:
+        return "daily", datetime.datetime.strptime(key, "%Y-%m-%d").date()
+    except ValueError:
+        pass
+
+    if key.count("-W") == 1:  # Format: YYYY-WNN
+        try:
+            year, week = key.split("-W")
+            return "weekly", (int(year), int(week))
+        except ValueError:
+            pass
+    return None, None
+
+
+class ScoreStore:
+    """Score rows keyed by date or week id.
+
+    The CSV keeps its ``key,score`` row format, but upserts are appended to the
+    end of the file instead of rewriting it, and the last row for a key wins.
+    Superseded rows are dropped by a background compaction once they outnumber
+    the live ones, so a save costs one small append regardless of history size.
+    The file is parsed on first use, or ahead of time by calling load() from a
+    worker thread. With a StateSnapshot the parsed rows are restored from it
+    while the file is unchanged since the last close().
+
+    Other processes may append to the same file. Upserts and compaction
+    run under ``lock`` (a cross-process DataLock) and first read the rows
+    appended since this process last looked, so nobody's rows are lost.
+    """
+
+    def __init__(self, path, min_compact_rows=256, snapshot=None, lock=None):
+        self.path = path
+        self.min_compact_rows = min_compact_rows
+        self.snapshot = snapshot
+        self._snapshot_name = os.path.basename(path)
+        self._data_lock = lock if lock is not None else contextlib.nullcontext()
+
+        self._lock = threading.RLock()
+        self._index = {}  # key -> score, in first-seen order
+        self._daily = {}  # date -> score
+        self._weekly = {}  # (year, week) -> score
+        self._file_rows = 0
+        self._needs_newline = False
+        self._compactor = None
+        self._compact_lock = threading.Lock()  # one compaction at a time
+        self._pending = None  # rows appended while a compaction is running
+        self._loaded = False
+        self._inode = None  # identity of the file the rows were read from
+        self._offset = 0  # bytes of that file read so far
+        self._generation = 0  # bumped whenever the rows are re-read from scratch
+
+    def load(self):
+        """Parse the log now instead of on first access"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _reset(self):
+        self._index, self._daily, self._weekly = {}, {}, {}
+        self._file_rows = 0
+        self._needs_newline = False
+        self._inode = None
+        self._offset = 0
+        self._generation += 1
+
+    def _load(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if self.snapshot is not None:
+            state = self.snapshot.lookup(self._snapshot_name, stat)
+            if state is not None:
+                self._restore(state)
+                self._inode, self._offset = stat.st_ino, stat.st_size
+                return
+        self._catch_up(final=False)
+
+    def _catch_up(self, final):
+        """Read the rows appended since the last call; returns whether there were any.
+
+        If the file was replaced (compacted by another process) every row
+        is read again. Without ``final`` an unterminated last line is left
+        for later, since its writer may still be busy; under the lock it
+        can only be a torn row and is read as it is.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            if self._inode is None:
+                return False
+            self._reset()
+            return True
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reset()
+                self._inode = stat.st_ino
+            elif stat.st_size == self._offset:
+                return False
+            f.seek(self._offset)
+            data = f.read()
+        if not final:
+            data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return False
+        self._offset += len(data)
+        self._needs_newline = not data.endswith(b"\n")
+
+        content = data.decode("utf-8")
+        PROFILER.record_read(self.path, content)
+        for row in csv.reader(content.splitlines()):
+            if len(row) < 2:
+                continue
+            self._file_rows += 1
+            try:
+                key, score = row[0], int(row[1])
+            except ValueError:
+                continue
+            self._set(key, score)
+            if self._pending is not None:
+                self._pending.append((key, score))
+        return True
+
+    def refresh(self):
+        """Read what other processes appended to the log; returns whether there was any"""
+        with self._lock:
+            if not self._loaded:
+                return False
+            return self._catch_up(final=False)
+
+    def _state(self):
+        """The parsed rows in marshal-able form; dates become ordinals"""
+        return (
+            self._file_rows,
+            self._needs_newline,
+            list(self._index.items()),
+            [(date.toordinal(), score) for date, score in self._daily.items()],
+            [(year, week, score) for (year, week), score in self._weekly.items()],
+        )
+
+    def _restore(self, state):
+        self._file_rows, self._needs_newline, index, daily, weekly = state
+        self._index = dict(index)
+        self._daily = {datetime.date.fromordinal(day): score for day, score in daily}
+        self._weekly = {(year, week): score for year, week, score in weekly}
+
+    def _set(self, key, score):
+        self._index[key] = score
+        kind, parsed = parse_score_key(key)
+        if kind == "daily":
+            self._daily[parsed] = score
+        elif kind == "weekly":
+            self._weekly[parsed] = score
+
+    def get(self, key, default=None):
+        self.load()
+        with self._lock:
+            return self._index.get(key, default)
+
+    def items(self):
+        """Return the live (key, score) rows in first-seen order"""
+        self.load()
+        with self._lock:
+            return list(self._index.items())
+
+    def daily_series(self):
+        """Return daily (date, score) pairs sorted by date"""
+        self.load()
+        with self._lock:
+            return sorted(self._daily.items())
+
+    def weekly_series(self):
+        """Return weekly ((year, week), score) pairs sorted by week"""
+        self.load()
+        with self._lock:
+            return sorted(self._weekly.items())
+
+    def upsert(self, key, score):
+        """Record the score for a key by appending one row to the log"""
+        score = int(score)
+        with self._data_lock, self._lock:
+            self.load()
+            self._catch_up(final=True)
+            if self._index.get(key) == score:
+                return
+
+            row = f"{key},{score}\r\n"
+            if self._needs_newline:
+                row = "\n" + row
+            WRITER.append(self.path, row, newline="")
+            stat = os.stat(self.path)
+            self._inode, self._offset = stat.st_ino, stat.st_size
+            self._needs_newline = False
+            PROFILER.record_write(self.path, row)
+
+            self._set(key, score)
+            self._file_rows += 1
+            if self._pending is not None:
+                self._pending.append((key, score))
+
+            if self._should_compact():
+                self.compact_async()
+
+    def _should_compact(self):
+        dead = self._file_rows - len(self._index)
+        return dead >= self.min_compact_rows and dead > len(self._index)
+
+    def compact(self):
+        """Rewrite the log with one row per key"""
+        with self._compact_lock:
+            self._compact()
+
+    def _compact(self):
+        self.load()
+        with self._lock:
+            rows = list(self._index.items())
+            generation = self._generation
+            self._pending = []
+
+        # Other processes may be compacting the same log at the same time
+        fd, tmp_path = make_temp(self.path)
+        try:
+            with open(fd, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows(rows)
+
+            with self._data_lock, self._lock:
+                # Rows appended to the old file during the rewrite, by us or
+                # by other processes, go last so they still win
+                self._catch_up(final=True)
+                if self._generation != generation:
+                    return  # replaced by someone else's compaction meanwhile
+                if self._pending:
+                    with open(tmp_path, "a", newline="", encoding="utf-8") as f:
+                        csv.writer(f).writerows(self._pending)
+                WRITER.commit_file(tmp_path, self.path)
+                stat = os.stat(self.path)
+                self._inode, self._offset = stat.st_ino, stat.st_size
+                self._file_rows = len(rows) + len(self._pending)
+                self._needs_newline = False
+        finally:
+            with self._lock:
+                self._pending = None
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)  # left over unless it was committed
+
+    def compact_async(self):
+        """Run compact() on a background thread unless one is already running"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(
+                target=self._compact_quietly, name="score-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    def _compact_quietly(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"Error compacting {self.path}: {e}")
+
+    def close(self):
+        """Wait for a running compaction to finish and update the snapshot"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if self.snapshot is None or not self._loaded:
+                return
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            if (stat.st_ino, stat.st_size) != (self._inode, self._offset):
+                return  # rows we have not read yet
+            self.snapshot.store(self._snapshot_name, stat, self._state())
@@ -0,0 +1,313 @@
+"""Incremental full-text index over daily logs and weekly reviews."""
+import contextlib
+import json
+import math
+import os
+import re
+import threading
+
+from .formats import DAILY_FIELDS, WEEKLY_FIELDS, parse_entry
+from .instrumentation import PROFILER
+from .persistence import make_temp
+
+# Searchable sections, their query names and ranking weights
+FIELDS = {
+    "daily": {
+        "Topic Covered": "topic",
+        "Key Takeaways": "takeaways",
+        "Questions": "questions",
+        "Reflection": "reflection",
+    },
+    "weekly": {
+        "Progress Summary": "summary",
+        "Challenges Faced": "challenges",
+        "Next Week Plans": "plans",
+    },
+}
+FIELD_WEIGHTS = {"topic": 3.0, "summary": 2.0}
+ENTRY_FIELDS = {"daily": DAILY_FIELDS, "weekly": WEEKLY_FIELDS}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1]
+
+
+def append_update(data_dir, kind, key, content):
+    """Log an entry change for an index that is not loaded in this process.
+
+    The change is applied the next time the index is loaded. Nothing is
+    written while there is no index yet, since its first load rebuilds it
+    from storage anyway.
+    """
+    snapshot_path = os.path.join(data_dir, "search_index.json")
+    log_path = os.path.join(data_dir, "search_index.log")
+    if not (os.path.exists(snapshot_path) or os.path.exists(log_path)):
+        return
+    fields = SearchIndex.analyze(kind, content) if content is not None else None
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": f"{kind}:{key}", "fields": fields}) + "\n")
+
+
+class SearchIndex:
+    """Inverted index stored as a JSON snapshot plus an update log.
+
+    ``postings`` maps term -> doc id -> field -> term frequency. Each
+    update() appends one line to the log; the log is folded into the
+    snapshot by compact(). Doc ids look like ``daily:2024-01-31`` and
+    ``weekly:2024-W05``.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, data_dir, compact_every=500):
+        self.snapshot_path = os.path.join(data_dir, "search_index.json")
+        self.log_path = os.path.join(data_dir, "search_index.log")
+        self.compact_every = compact_every
+
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self.postings = {}
+        self.doc_terms = {}  # doc id -> {field: {term: tf}}
+        self.doc_lengths = {}
+        self._total_length = 0
+        self._log_entries = 0
+        self._touched = None  # doc ids updated while rebuild() scans
+        self.needs_rebuild = not (
+            os.path.exists(self.snapshot_path) or os.path.exists(self.log_path)
+        )
+
+        self._load()
+
+    def _load(self):
+        docs = {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                docs = json.load(f).get("docs", {})
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Error reading search index, it will be rebuilt: {e}")
+            self.needs_rebuild = True
+            return
+
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line
+                    docs.pop(record["id"], None)
+                    if record.get("fields") is not None:
+                        docs[record["id"]] = record["fields"]
+                    self._log_entries += 1
+        except FileNotFoundError:
+            pass
+        self._swap(self._build(docs))
+
+    @staticmethod
+    def _build(docs):
+        """Index structures for {doc id: fields}, built without touching self"""
+        postings, lengths, total = {}, {}, 0
+        for doc_id, fields in docs.items():
+            length = sum(sum(terms.values()) for terms in fields.values())
+            lengths[doc_id] = length
+            total += length
+            for field, terms in fields.items():
+                for term, tf in terms.items():
+                    postings.setdefault(term, {}).setdefault(doc_id, {})[field] = tf
+        return postings, dict(docs), lengths, total
+
+    def _swap(self, built):
+        with self._lock:
+            self.postings, self.doc_terms, self.doc_lengths, self._total_length = built
+
+    def _add(self, doc_id, fields):
+        self.doc_terms[doc_id] = fields
+        length = sum(sum(terms.values()) for terms in fields.values())
+        self.doc_lengths[doc_id] = length
+        self._total_length += length
+        for field, terms in fields.items():
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {}).setdefault(doc_id, {})[field] = tf
+
+    def _remove(self, doc_id):
+        fields = self.doc_terms.pop(doc_id, None)
+        self._total_length -= self.doc_lengths.pop(doc_id, 0)
+        if not fields:
+            return
+        for terms in fields.values():
+            for term in terms:
+                docs = self.postings.get(term)
+                if docs is None:
+                    continue
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    @staticmethod
+    def analyze(kind, content):
+        """Return {field: {term: tf}} for an entry's ``Key: value`` text"""
+        sections = parse_entry(content, ENTRY_FIELDS[kind])
+        fields = {}
+        for section, field in FIELDS[kind].items():
+            terms = {}
+            for token in tokenize(sections.get(section, "")):
+                terms[token] = terms.get(token, 0) + 1
+            if terms:
+                fields[field] = terms
+        return fields
+
+    def update(self, kind, key, content):
+        """Index (or re-index) one entry and log the change"""
+        doc_id = f"{kind}:{key}"
+        fields = self.analyze(kind, content) if content is not None else None
+        with self._lock:
+            self._remove(doc_id)
+            if fields is not None:
+                self._add(doc_id, fields)
+            if self._touched is not None:
+                self._touched.add(doc_id)
+            line = json.dumps({"id": doc_id, "fields": fields}) + "\n"
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+            PROFILER.record_write(self.log_path, line)
+            self._log_entries += 1
+            due = self._log_entries >= self.compact_every
+        if due:
+            self.compact()
+
+    def remove(self, kind, key):
+        self.update(kind, key, None)
+
+    def rebuild(self, storage):
+        """Index every entry in a storage backend from scratch.
+
+        Entries are read and analyzed without holding the lock, so search()
+        and update() keep working meanwhile. Entries updated during the
+        scan keep their updated terms when the new index is swapped in.
+        """
+        with self._lock:
+            self._touched = set()
+        try:
+            docs = {}
+            for kind, list_keys, read in (
+                ("daily", storage.list_daily, storage.read_daily),
+                ("weekly", storage.list_weekly, storage.read_weekly),
+            ):
+                for key in list_keys():
+                    content = read(key)
+                    if content is not None:
+                        docs[f"{kind}:{key}"] = self.analyze(kind, content)
+            built = self._build(docs)
+
+            with self._lock:
+                updated = {doc_id: self.doc_terms.get(doc_id) for doc_id in self._touched}
+                self._swap(built)
+                for doc_id, fields in updated.items():
+                    self._remove(doc_id)
+                    if fields is not None:
+                        self._add(doc_id, fields)
+            self.compact()
+            self.needs_rebuild = False
+        finally:
+            with self._lock:
+                self._touched = None
+
+    def compact(self):
+        """Write the snapshot and truncate the update log.
+
+        The snapshot is serialized outside the lock; log lines appended in
+        the meantime are not in it, so they are kept in the new log.
+        """
+        with self._compact_lock:
+            with self._lock:
+                docs = dict(self.doc_terms)
+                try:
+                    logged = os.path.getsize(self.log_path)
+                except FileNotFoundError:
+                    logged = 0
+
+            fd, tmp_path = make_temp(self.snapshot_path)
+            try:
+                with open(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "docs": docs}, f)
+                with self._lock:
+                    os.replace(tmp_path, self.snapshot_path)
+                    self._truncate_log(logged)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+                raise
+
+    def _truncate_log(self, size):
+        """Drop the first ``size`` bytes of the log, now folded into the snapshot"""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(size)
+                tail = f.read()
+        except FileNotFoundError:
+            tail = b""
+        self._log_entries = tail.count(b"\n")
+        if not tail:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.log_path)
+            return
+        fd, tmp_path = make_temp(self.log_path)
+        try:
+            with open(fd, "wb") as f:
+                f.write(tail)
+            os.replace(tmp_path, self.log_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    def search(self, query, limit=50):
+        """Return (doc_id, score) pairs matching every query term, best first.
+
+        A term may be restricted to one section with ``field:term``, e.g.
+        ``topic:python`` or ``challenges:time``.
+        """
+        clauses = []
+        for part in query.split():
+            field, _, text = part.rpartition(":")
+            for term in tokenize(text):
+                clauses.append((field.lower() or None, term))
+        if not clauses:
+            return []
+
+        with self._lock:
+            total_docs = len(self.doc_lengths)
+            if not total_docs:
+                return []
+            avg_length = self._total_length / total_docs or 1
+
+            scores = None
+            for field, term in clauses:
+                docs = self.postings.get(term, {})
+                idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                term_scores = {}
+                for doc_id, field_tfs in docs.items():
+                    if field is not None:
+                        field_tfs = {field: field_tfs[field]} if field in field_tfs else {}
+                    tf = sum(FIELD_WEIGHTS.get(f, 1.0) * n for f, n in field_tfs.items())
+                    if not tf:
+                        continue
+                    norm = 1 - self.B + self.B * self.doc_lengths[doc_id] / avg_length
+                    term_scores[doc_id] = idf * tf * (self.K1 + 1) / (tf + self.K1 * norm)
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc_id: score + term_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in term_scores}
+                if not scores:
+                    return []
+
+        # Ties go to the newest entry
+        ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+        return ranked[:limit]
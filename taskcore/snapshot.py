@@ -0,0 +1,106 @@
+"""Parsed startup state cached between runs, keyed by source file signature.
+
+Each entry maps a data file name to the (st_mtime_ns, st_size) the file had
+when it was parsed, and to the parsed value. A lookup only returns the value
+while the file on disk still has that signature, so a file edited by another
+program or process is simply parsed again. Values must be marshal-able
+(str, int, bool, list, tuple, dict, None).
+"""
+import contextlib
+import marshal
+import os
+import threading
+
+from .persistence import make_temp
+
+MAGIC = b"TMSNAP2" + bytes([marshal.version])
+
+
+def signature(stat):
+    return stat.st_mtime_ns, stat.st_size
+
+
+class StateSnapshot:
+    """In-memory entries, loaded lazily from and saved back to one file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None  # name -> (mtime_ns, size, value)
+        self._touched = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        self._entries = {}
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        if not data.startswith(MAGIC):
+            return  # written by another format or Python version
+        try:
+            entries = marshal.loads(data[len(MAGIC):])
+        except (EOFError, ValueError, TypeError) as e:
+            print(f"Error reading startup snapshot, it will be rebuilt: {e}")
+            return
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def lookup(self, name, stat):
+        """Return the value stored for a file if it is unchanged, else None"""
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            entry = self._entries.get(name)
+            if entry is None or entry[:2] != signature(stat):
+                self.misses += 1
+                return None
+            self._touched.add(name)
+            self.hits += 1
+            return entry[2]
+
+    def store(self, name, stat, value):
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            entry = (*signature(stat), value)
+            if self._entries.get(name) != entry:
+                self._entries[name] = entry
+                self._dirty = True
+            self._touched.add(name)
+
+    def discard(self, name):
+        with self._lock:
+            if self._entries is not None and self._entries.pop(name, None) is not None:
+                self._dirty = True
+
+    def save(self, keep_untouched=lambda name: True):
+        """Write the entries back if anything changed.
+
+        Entries neither read nor stored during this run are only kept when
+        ``keep_untouched(name)`` is true.
+        """
+        with self._lock:
+            if self._entries is None:
+                return
+            entries = {
+                name: entry for name, entry in self._entries.items()
+                if name in self._touched or keep_untouched(name)
+            }
+            if not self._dirty and len(entries) == len(self._entries):
+                return
+            fd, tmp_path = make_temp(self.path)
+            try:
+                with open(fd, "wb") as f:
+                    f.write(MAGIC)
+                    marshal.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+                raise
+            self._entries = entries
+            self._dirty = False
@@ -0,0 +1,331 @@
+"""SQLite storage backend and the one-shot migrator from text files."""
+import datetime
+import os
+import sqlite3
+import threading
+
+from .score_store import parse_score_key
+from .storage import FileStorage, Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS todo_days (
+    date TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS todo_items (
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    PRIMARY KEY (date, position)
+);
+CREATE TABLE IF NOT EXISTS lists (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS list_items (
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    PRIMARY KEY (name, position)
+);
+CREATE TABLE IF NOT EXISTS daily_logs (
+    date TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS weekly_reviews (
+    week_id TEXT PRIMARY KEY,
+    year INTEGER,
+    week INTEGER,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_weekly_reviews_week ON weekly_reviews (year, week);
+CREATE TABLE IF NOT EXISTS scores (
+    key TEXT PRIMARY KEY,
+    kind TEXT,
+    date TEXT,
+    year INTEGER,
+    week INTEGER,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_date ON scores (date) WHERE kind = 'daily';
+CREATE INDEX IF NOT EXISTS idx_scores_week ON scores (year, week) WHERE kind = 'weekly';
+"""
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SQLiteScoreStore:
+    """ScoreStore API over the ``scores`` table"""
+
+    def __init__(self, conn, lock):
+        self._conn = conn
+        self._lock = lock
+
+    def load(self):
+        """Nothing to preload; rows are queried on demand"""
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else default
+
+    def items(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, score FROM scores ORDER BY rowid"
+            ).fetchall()
+
+    def daily_series(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, score FROM scores WHERE kind = 'daily' ORDER BY date"
+            ).fetchall()
+        return [(datetime.date.fromisoformat(date), score) for date, score in rows]
+
+    def weekly_series(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT year, week, score FROM scores WHERE kind = 'weekly' "
+                "ORDER BY year, week"
+            ).fetchall()
+        return [((year, week), score) for year, week, score in rows]
+
+    def upsert(self, key, score):
+        with self._lock, self._conn:
+            self._upsert(self._conn, key, int(score))
+
+    @staticmethod
+    def _upsert(conn, key, score):
+        kind, parsed = parse_score_key(key)
+        date = parsed.isoformat() if kind == "daily" else None
+        year, week = parsed if kind == "weekly" else (None, None)
+        conn.execute(
+            "INSERT INTO scores (key, kind, date, year, week, score) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET score = excluded.score",
+            (key, kind, date, year, week, score),
+        )
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage(Storage):
+    """All state in one SQLite database in WAL mode.
+
+    SQLite already serializes writers across processes. List writes read
+    and merge the stored list in the same IMMEDIATE transaction, and
+    changed_elsewhere() compares ``PRAGMA data_version``, which changes
+    when another connection commits.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = connect(db_path)
+        self._lock = threading.RLock()
+        self.scores = SQLiteScoreStore(self._conn, self._lock)
+        self._data_version = None
+        self.changed_elsewhere()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _read_list(self, name):
+        with self._lock:
+            if not self._conn.execute(
+                "SELECT 1 FROM lists WHERE name = ?", (name,)
+            ).fetchone():
+                return None
+            rows = self._conn.execute(
+                "SELECT text, done FROM list_items WHERE name = ? ORDER BY position",
+                (name,),
+            ).fetchall()
+        return [(text, bool(done)) for text, done in rows]
+
+    def _write_list(self, name, tasks, base=None):
+        tasks = [(text, bool(done)) for text, done in tasks]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            tasks = self._merge(self._read_list(name), tasks, base)
+            self._conn.execute("INSERT OR IGNORE INTO lists (name) VALUES (?)", (name,))
+            self._conn.execute("DELETE FROM list_items WHERE name = ?", (name,))
+            self._conn.executemany(
+                "INSERT INTO list_items (name, position, text, done) VALUES (?, ?, ?, ?)",
+                [(name, i, text, int(done)) for i, (text, done) in enumerate(tasks)],
+            )
+        return tasks
+
+    def read_goal_date(self):
+        rows = self._query("SELECT value FROM settings WHERE key = 'goal_date'")
+        return rows[0][0] if rows else None
+
+    def write_goal_date(self, date_str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('goal_date', ?)",
+                (date_str,),
+            )
+
+    def read_todo(self, date_str):
+        with self._lock:
+            if not self._conn.execute(
+                "SELECT 1 FROM todo_days WHERE date = ?", (date_str,)
+            ).fetchone():
+                return None
+            rows = self._conn.execute(
+                "SELECT text, done FROM todo_items WHERE date = ? ORDER BY position",
+                (date_str,),
+            ).fetchall()
+        return [(text, bool(done)) for text, done in rows]
+
+    def write_todo(self, date_str, tasks, base=None):
+        tasks = [(text, bool(done)) for text, done in tasks]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            tasks = self._merge(self.read_todo(date_str), tasks, base)
+            self._write_todo(self._conn, date_str, tasks)
+        return tasks
+
+    @staticmethod
+    def _write_todo(conn, date_str, tasks):
+        conn.execute("INSERT OR IGNORE INTO todo_days (date) VALUES (?)", (date_str,))
+        conn.execute("DELETE FROM todo_items WHERE date = ?", (date_str,))
+        conn.executemany(
+            "INSERT INTO todo_items (date, position, text, done) VALUES (?, ?, ?, ?)",
+            [(date_str, i, text, int(done)) for i, (text, done) in enumerate(tasks)],
+        )
+
+    def list_todo_dates(self):
+        return [row[0] for row in self._query("SELECT date FROM todo_days ORDER BY date")]
+
+    def read_custom_tasks(self):
+        tasks = self._read_list("custom")
+        return None if tasks is None else [text for text, _ in tasks]
+
+    def write_custom_tasks(self, tasks, base=None):
+        if base is not None:
+            base = [(text, False) for text in base]
+        stored = self._write_list("custom", [(text, False) for text in tasks], base)
+        return [text for text, _ in stored]
+
+    def read_progress(self):
+        return self._read_list("progress") or []
+
+    def write_progress(self, tasks, base=None):
+        return self._write_list("progress", tasks, base)
+
+    def read_learning(self):
+        return self._read_list("learning")
+
+    def write_learning(self, tasks, base=None):
+        return self._write_list("learning", tasks, base)
+
+    def read_daily(self, date_str):
+        rows = self._query("SELECT content FROM daily_logs WHERE date = ?", (date_str,))
+        return rows[0][0] if rows else None
+
+    def write_daily(self, date_str, content):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO daily_logs (date, content) VALUES (?, ?)",
+                (date_str, content),
+            )
+        self._run_save_hooks("daily", date_str, content)
+
+    def list_daily(self, limit=None):
+        rows = self._query(
+            "SELECT date FROM daily_logs ORDER BY date DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [row[0] for row in rows]
+
+    def read_weekly(self, week_id):
+        rows = self._query(
+            "SELECT content FROM weekly_reviews WHERE week_id = ?", (week_id,)
+        )
+        return rows[0][0] if rows else None
+
+    def write_weekly(self, week_id, content):
+        year, week = week_id.split("-W")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO weekly_reviews (week_id, year, week, content) "
+                "VALUES (?, ?, ?, ?)",
+                (week_id, int(year), int(week), content),
+            )
+        self._run_save_hooks("weekly", week_id, content)
+
+    def list_weekly(self, limit=None):
+        rows = self._query(
+            "SELECT week_id FROM weekly_reviews ORDER BY year DESC, week DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [row[0] for row in rows]
+
+    def changed_elsewhere(self):
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            changed = self._data_version is not None and version != self._data_version
+            self._data_version = version
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_files_to_sqlite(data_dir, db_path):
+    """Import every text file in a data directory into a new database.
+
+    The database is built under a temporary name and renamed into place, so
+    an interrupted migration is simply retried on the next start.
+    """
+    source = FileStorage(data_dir)
+    tmp_path = db_path + ".migrating"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    target = SQLiteStorage(tmp_path)
+    try:
+        with target._conn:
+            conn = target._conn
+            goal_date = source.read_goal_date()
+            if goal_date:
+                conn.execute(
+                    "INSERT INTO settings (key, value) VALUES ('goal_date', ?)",
+                    (goal_date,),
+                )
+            for date_str in source.list_todo_dates():
+                SQLiteStorage._write_todo(conn, date_str, source.read_todo(date_str))
+            for key, score in source.scores.items():
+                SQLiteScoreStore._upsert(conn, key, score)
+
+        custom_tasks = source.read_custom_tasks()
+        if custom_tasks is not None:
+            target.write_custom_tasks(custom_tasks)
+        target.write_progress(source.read_progress())
+        learning = source.read_learning()
+        if learning is not None:
+            target.write_learning(learning)
+        for date_str in source.list_daily():
+            target.write_daily(date_str, source.read_daily(date_str))
+        for week_id in source.list_weekly():
+            target.write_weekly(week_id, source.read_weekly(week_id))
+    finally:
+        target.close()
+        source.close()
+
+    os.replace(tmp_path, db_path)
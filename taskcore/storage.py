@@ -0,0 +1,708 @@
+"""Storage backends behind the app's load_*/save_* methods."""
+import contextlib
+import datetime
+import os
+import threading
+import zlib
+from collections import namedtuple
+
+from .formats import (
+    DATE_RE, WEEK_ID_RE, format_status_lines, parse_status_lines,
+)
+from .instrumentation import PROFILER
+from .journal import (
+    ListJournal, diff_ops, format_generation, list_checksum, merge_lists, new_generation,
+    split_generation,
+)
+from .layout import DirectoryIndex, migrate_to_shards, shard_of
+from .locking import DataLock
+from .persistence import WRITER, WriteBehindQueue
+from .score_store import ScoreStore
+from .snapshot import StateSnapshot
+from .todo_archive import PackCache, pack_name, write_pack
+from .watch import ChangeTracker, classify
+
+
+# A task list save waiting in the write-behind queue. ``base`` is the list
+# it was merged against, so the flush can merge again with later outside edits.
+PendingList = namedtuple("PendingList", "name tasks base read_file format_list")
+
+# A task list file as read: its generation id (see journal) and its tasks
+ListFile = namedtuple("ListFile", "generation tasks")
+
+# A list file with its journal replayed. ``signature`` is _file_signature()
+# taken before reading; ``checksum`` is list_checksum(listed.tasks), or None
+# until a journal needs it.
+ReplayedList = namedtuple("ReplayedList", "signature listed tasks records clean checksum")
+
+
+def parse_task_file(content):
+    return parse_status_lines(content.splitlines())
+
+
+def parse_custom_tasks(content):
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def format_custom_tasks(tasks):
+    return "\n".join(text for text, _ in tasks)
+
+
+def parse_list_file(parse):
+    """Wrap a list parser to return (generation, tasks) for a list file"""
+    def parse_file(content):
+        generation, content = split_generation(content)
+        return generation, parse(content)
+    return parse_file
+
+
+class Storage:
+    """Interface for all persistent state.
+
+    Task lists are lists of (text, done) pairs. Daily logs and weekly reviews
+    are stored as their rendered ``Key: value`` text, keyed by date string and
+    week id. ``scores`` exposes the ScoreStore API.
+
+    Task list writes accept the list the caller started editing from as
+    ``base``. If the stored list changed since (another process saved it),
+    both sets of edits are merged (see journal.merge_lists) instead of the
+    caller's list replacing the other one. They return the list stored.
+    """
+
+    scores = None
+    _save_hooks = ()
+
+    def add_save_hook(self, hook):
+        """Call ``hook(kind, key, content)`` after a daily log or weekly review is saved"""
+        self._save_hooks = [*self._save_hooks, hook]
+
+    def _run_save_hooks(self, kind, key, content):
+        for hook in self._save_hooks:
+            try:
+                hook(kind, key, content)
+            except Exception as e:
+                print(f"Error in save hook for {kind} {key}: {e}")
+
+    @staticmethod
+    def _merge(current, tasks, base):
+        """The list to store for ``tasks`` edited from ``base`` when ``current`` is stored.
+
+        ``tasks`` must be (text, bool) pairs already.
+        """
+        if base is None or current is None or current == base:
+            return tasks
+        return merge_lists(base, tasks, current)
+
+    def read_goal_date(self):
+        raise NotImplementedError
+
+    def write_goal_date(self, date_str):
+        raise NotImplementedError
+
+    def read_todo(self, date_str):
+        """Return the task list for a day, or None if that day has none"""
+        raise NotImplementedError
+
+    def write_todo(self, date_str, tasks, base=None):
+        raise NotImplementedError
+
+    def list_todo_dates(self):
+        """Return the dates that have a task list, oldest first"""
+        raise NotImplementedError
+
+    def read_custom_tasks(self):
+        """Return the task template, or None if none was ever saved"""
+        raise NotImplementedError
+
+    def write_custom_tasks(self, tasks, base=None):
+        raise NotImplementedError
+
+    def read_progress(self):
+        raise NotImplementedError
+
+    def write_progress(self, tasks, base=None):
+        raise NotImplementedError
+
+    def read_learning(self):
+        """Return the learning tasks, or None if none were ever saved"""
+        raise NotImplementedError
+
+    def write_learning(self, tasks, base=None):
+        raise NotImplementedError
+
+    def read_daily(self, date_str):
+        raise NotImplementedError
+
+    def write_daily(self, date_str, content):
+        raise NotImplementedError
+
+    def list_daily(self, limit=None):
+        """Return daily log dates, newest first"""
+        raise NotImplementedError
+
+    def read_weekly(self, week_id):
+        raise NotImplementedError
+
+    def write_weekly(self, week_id, content):
+        raise NotImplementedError
+
+    def list_weekly(self, limit=None):
+        """Return weekly review ids, newest first"""
+        raise NotImplementedError
+
+    def archive_closed_months(self, today=None):
+        """Compact the task lists of past months; returns the days archived"""
+        return 0
+
+    def group_commit(self):
+        """Context manager making the writes of one user action durable together"""
+        return contextlib.nullcontext()
+
+    def refresh_index(self):
+        """Pick up files added or removed by another process"""
+
+    def watch_paths(self):
+        """Paths a file system watcher should follow for outside changes"""
+        return []
+
+    def poll_changes(self, paths):
+        """Return {kind: keys} changed by other programs under watched ``paths``"""
+        return {}
+
+    def changed_elsewhere(self):
+        """Whether another process saved anything since the last call; cheap to poll"""
+        return False
+
+    def flush(self):
+        """Make every buffered write durable"""
+
+    def close(self):
+        self.scores.close()
+
+
+class FileStorage(Storage):
+    """The original flat ``task_data/`` text-file layout.
+
+    With ``write_behind`` the whole-file writes go through a WriteBehindQueue
+    and reach the disk shortly after the last save instead of on every one.
+
+    Task lists of closed months may live in ``todo_<YYYY-MM>.pack`` files
+    (see todo_archive). A loose todo_<date>.txt always wins over the pack,
+    so writing an archived day simply creates the loose file again.
+
+    Parsed startup files (goal date, task lists, today's todo, the score
+    log) are kept in ``startup_snapshot.bin`` on close and reused on the
+    next start for every file whose mtime and size are unchanged.
+
+    Saving a task list (todo, custom, progress, learning) appends the edit
+    to the list's journal (see journal) instead of rewriting the file. Once
+    a journal holds more records than ``checkpoint_records`` or the list
+    has rows, the list file is rewritten atomically and the journal
+    dropped. With ``write_behind`` the list goes through the queue like the
+    other files, so quick successive edits cost one append, synced off the
+    calling thread; reads see the queued list until it is written. The
+    replayed lists most recently used are kept in memory while their files
+    are unchanged, so saving one does not re-read, re-hash or replay it.
+
+    Dated files are sharded into year/month directories (see layout) and
+    listed from a DirectoryIndex that the save paths keep current. Every
+    file written here is also noted in a ChangeTracker, so poll_changes()
+    only reports what other programs did.
+
+    Every write holds ``data.lock`` (see locking), so several processes can
+    share the directory: lists are re-read and merged under the lock, and
+    the score log picks up other processes' rows before appending.
+    """
+
+    checkpoint_records = 64
+    replay_cache_size = 16  # lists kept replayed; the hot ones are today's and the shared ones
+
+    def __init__(self, data_dir, write_behind=False):
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.lock = DataLock(os.path.join(self.data_dir, "data.lock"))
+        self.lock.changed_elsewhere()  # start counting from now
+        with self.lock:
+            migrate_to_shards(self.data_dir)
+        self.index = DirectoryIndex(self.data_dir)
+        self.tracker = ChangeTracker(self.data_dir)
+        self.snapshot = StateSnapshot(self._path("startup_snapshot.bin"))
+        self.scores = ScoreStore(self._path("task_score.csv"), snapshot=self.snapshot,
+                                 lock=self.lock)
+        self.write_queue = (WriteBehindQueue(self._write_file, lock=self.lock)
+                            if write_behind else None)
+        self.packs = PackCache(self._path)
+        self._archive_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._replays = {}  # list name -> ReplayedList, least recently used first
+
+    def _path(self, name):
+        return os.path.join(self.data_dir, shard_of(name), name)
+
+    def _created(self, name):
+        """Prepare the shard directory for a new file and index the file"""
+        if shard_of(name):
+            WRITER.makedirs(os.path.dirname(self._path(name)))
+        self.index.add(name)
+
+    def _pending(self, path):
+        return self.write_queue.pending(path) if self.write_queue is not None else None
+
+    def _pending_text(self, path):
+        """Queued content of a whole-file write; a queued list is read by _read_list()"""
+        content = self._pending(path)
+        return None if isinstance(content, PendingList) else content
+
+    def _read_text(self, name):
+        """Return a file's content, or None if it does not exist"""
+        path = self._path(name)
+        content = self._pending_text(path)
+        if content is not None:
+            return content
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        PROFILER.record_read(path, content)
+        return content
+
+    def _read_parsed(self, name, parse):
+        """Return ``parse(content)`` for a file, or None if it does not exist.
+
+        The result comes from the snapshot while the file is unchanged, so
+        ``parse`` must return marshal-able data. Lists are copied because
+        callers may modify them.
+        """
+        path = self._path(name)
+        content = self._pending_text(path)
+        if content is not None:
+            return parse(content)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        value = self.snapshot.lookup(name, stat)
+        if value is None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                    stat = os.fstat(f.fileno())
+            except FileNotFoundError:
+                return None
+            PROFILER.record_read(path, content)
+            value = parse(content)
+            self.snapshot.store(name, stat, value)
+        return list(value) if isinstance(value, list) else value
+
+    def _write_text(self, name, content):
+        path = self._path(name)
+        self._created(name)
+        self.snapshot.discard(name)
+        if self.write_queue is not None:
+            self.write_queue.submit(path, content)
+        else:
+            self._write_file(path, content)
+
+    def _journal(self, name):
+        return ListJournal(self._path(name[:-len(".txt")] + ".journal"))
+
+    def _read_list_file(self, name, parse, cached=True):
+        """Return a list file as a ListFile, or None if it does not exist.
+
+        ``cached`` reads it through the startup snapshot.
+        """
+        parse_file = parse_list_file(parse)
+        if cached:
+            value = self._read_parsed(name, parse_file)
+        else:
+            content = self._read_text(name)
+            value = parse_file(content) if content is not None else None
+        if value is None:
+            return None
+        generation, tasks = value
+        return ListFile(generation, list(tasks))
+
+    def _replayed(self, name, read_file):
+        """The list file with its journal replayed, as a ReplayedList, or None.
+
+        Kept while neither file changes, so an unchanged list costs two
+        stats instead of a read, a checksum of the whole list and a replay.
+        The checksum is only recomputed when the list file changes, i.e.
+        after a checkpoint. The result is shared; do not modify its lists.
+        """
+        signature = self._file_signature(name)
+        with self._replay_lock:
+            cached = self._replays.pop(name, None)
+            if cached is not None:
+                self._replays[name] = cached
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        if cached is not None and cached.signature[0] == signature[0]:
+            listed = cached.listed  # only the journal changed
+        else:
+            listed = read_file()
+        if listed is None:
+            with self._replay_lock:
+                self._replays.pop(name, None)
+            return None
+        checksum = None
+        if cached is not None and cached.listed is listed:
+            checksum = cached.checksum
+        if checksum is None and signature[1] is not None:
+            checksum = list_checksum(listed.tasks)
+        tasks, records, clean = self._journal(name).replay(listed.tasks, listed.generation,
+                                                           checksum)
+        replayed = ReplayedList(signature, listed, tasks, records, clean, checksum)
+        self._remember(name, replayed)
+        return replayed
+
+    def _remember(self, name, replayed):
+        with self._replay_lock:
+            self._replays.pop(name, None)
+            self._replays[name] = replayed
+            while len(self._replays) > self.replay_cache_size:
+                del self._replays[next(iter(self._replays))]
+
+    def _replay(self, name, read_file):
+        """The list file plus its journal as a new list, or None"""
+        replayed = self._replayed(name, read_file)
+        return list(replayed.tasks) if replayed is not None else None
+
+    def _read_list(self, name, read_file):
+        """The list as saved: queued, or the file plus its journal"""
+        pending = self._pending(self._path(name))
+        if isinstance(pending, PendingList):
+            return list(pending.tasks)
+        return self._replay(name, read_file)
+
+    def _write_list(self, name, tasks, read_file, format_list, base=None):
+        """Save a task list, through the write-behind queue if there is one.
+
+        ``read_file()`` returns the list file without its journal as a
+        ListFile, or None if the file does not exist yet. Returns the list stored, which
+        differs from ``tasks`` if it had to be merged with another process's
+        edits since ``base``.
+        """
+        tasks = [(text, bool(done)) for text, done in tasks]
+        if self.write_queue is None:
+            return self._save_list(name, tasks, read_file, format_list, base)
+
+        path = self._path(name)
+        pending = self._pending(path)
+        if isinstance(pending, PendingList):
+            # Replacing a queued save: the flush still merges against the
+            # list that one started from
+            current, saved = pending.tasks, pending.base
+        else:
+            current = saved = self._replay(name, read_file)
+        tasks = self._merge(current, tasks, base)
+        if base is None:
+            saved = None  # the caller overwrites whatever is stored
+        self.write_queue.submit(path, PendingList(name, tasks, saved, read_file, format_list))
+        return tasks
+
+    def _save_list(self, name, tasks, read_file, format_list, base):
+        """Write a task list as journal records, or as a checkpoint of the file"""
+        with self.lock, self._journal_lock:
+            journal = self._journal(name)
+            replayed = self._replayed(name, read_file)
+            if replayed is not None:
+                current = replayed.tasks
+                tasks = self._merge(current, tasks, base)
+                ops = diff_ops(current, tasks)
+                if not ops:
+                    return tasks
+                records = replayed.records + len(ops)
+                if replayed.clean and records <= max(self.checkpoint_records, len(tasks)):
+                    listed = replayed.listed
+                    checksum = replayed.checksum
+                    if checksum is None:
+                        checksum = list_checksum(listed.tasks)
+                    data = journal.append(listed.tasks, ops, listed.generation, checksum)
+                    self.tracker.note(journal.path)
+                    PROFILER.record_write(journal.path, data)
+                    # The journal now replays to ``tasks``
+                    self._remember(name, replayed._replace(
+                        signature=self._file_signature(name), tasks=list(tasks),
+                        records=records, checksum=checksum,
+                    ))
+                    return tasks
+
+            path = self._path(name)
+            content = format_generation(new_generation()) + format_list(tasks)
+            self._created(name)
+            WRITER.replace(path, content)
+            PROFILER.record_write(path, content)
+            self.snapshot.discard(name)
+            # A crash before this leaves a stale journal, which replay
+            # ignores since the file now has a new generation id
+            WRITER.remove(journal.path)
+            self.tracker.note(path)
+            self.tracker.note(journal.path)
+            # Read back on next use, so the base is the list as parsed
+            with self._replay_lock:
+                self._replays.pop(name, None)
+        return tasks
+
+    def _write_file(self, path, content):
+        if isinstance(content, PendingList):
+            self._save_list(content.name, content.tasks, content.read_file,
+                            content.format_list, content.base)
+            return
+        with self.lock:
+            WRITER.replace(path, content)
+        self.tracker.note(path)
+        PROFILER.record_write(path, content)
+
+    def _list_keys(self, prefix, pattern, limit):
+        """Keys of the ``<prefix>_<key>.txt`` files, newest first"""
+        if limit is not None:
+            return self.index.keys(prefix, ".txt", pattern, newest=limit)
+        return self.index.keys(prefix, ".txt", pattern)[::-1]
+
+    def refresh_index(self):
+        """Rescan the data directory after changes made by another process"""
+        self.index.refresh()
+
+    def watch_paths(self):
+        directories, _ = self.tracker.directories()
+        return directories + self.tracker.appended_files()
+
+    def poll_changes(self, paths):
+        """Return {kind: keys} for files other programs changed under ``paths``.
+
+        Kinds are those of watch.classify. The index is updated on the way,
+        and the score log is re-read if it changed.
+        """
+        _, new_directories = self.tracker.directories()
+        changes = {}
+        for path in [*paths, *new_directories]:
+            for name in self.tracker.scan(path):
+                if name.endswith(".tmp"):
+                    continue
+                if os.path.exists(self._path(name)):
+                    self.index.add(name)
+                else:
+                    self.index.discard(name)
+                kind = classify(name)
+                if kind is None:
+                    continue
+                if kind[0] == "scores" and not self.scores.refresh():
+                    continue  # our own appends
+                changes.setdefault(kind[0], set()).add(kind[1])
+        return changes
+
+    def changed_elsewhere(self):
+        return self.lock.changed_elsewhere()
+
+    def read_goal_date(self):
+        return self._read_parsed("goal_date.txt", str.strip) or None
+
+    def write_goal_date(self, date_str):
+        self._write_text("goal_date.txt", date_str)
+
+    def _read_packed(self, date_str):
+        try:
+            pack = self.packs.get(date_str[:7])
+            return pack.read(date_str) if pack is not None else None
+        except (OSError, ValueError, KeyError, zlib.error) as e:
+            print(f"Error reading archived tasks for {date_str}: {e}")
+            return None
+
+    def _read_todo_file(self, date_str):
+        name = f"todo_{date_str}.txt"
+        # Today's list is read on every start, and never archived
+        return self._read_list_file(name, parse_task_file,
+                                    cached=date_str == datetime.date.today().isoformat())
+
+    def read_todo(self, date_str):
+        tasks = self._read_list(f"todo_{date_str}.txt", lambda: self._read_todo_file(date_str))
+        if tasks is not None:
+            return tasks
+        content = self._read_packed(date_str)
+        return parse_task_file(content) if content is not None else None
+
+    def write_todo(self, date_str, tasks, base=None):
+        return self._write_list(f"todo_{date_str}.txt", tasks,
+                                lambda: self._read_todo_file(date_str), format_status_lines,
+                                base)
+
+    def list_todo_dates(self):
+        dates = set(self.index.keys("todo", ".txt", DATE_RE))
+        for month in self.index.keys("todo", ".pack"):
+            try:
+                dates.update(self.packs.get(month).days)
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                print(f"Error reading task archive for {month}: {e}")
+        return sorted(dates)
+
+    def archive_closed_months(self, today=None):
+        """Move the loose todo files of every month before today's into packs.
+
+        The current month is never touched. A file that changes while its
+        month is being packed is left in place and shadows the packed copy
+        until the next run.
+        """
+        current_month = (today or datetime.date.today()).isoformat()[:7]
+        self.flush()
+        by_month = {}
+        for date_str in self._list_keys("todo", DATE_RE, None):
+            if date_str[:7] < current_month:
+                by_month.setdefault(date_str[:7], []).append(date_str)
+
+        archived = 0
+        with self._archive_lock:
+            for month, dates in sorted(by_month.items()):
+                # Per month, so other processes wait for one pack at most
+                with self.lock:
+                    pack = self.packs.get(month)
+                    days = pack.read_all() if pack is not None else {}
+                    packed = {}
+                    for date_str in dates:
+                        name = f"todo_{date_str}.txt"
+                        signature = self._file_signature(name)
+                        tasks = self._replay(name, lambda: self._read_todo_file(date_str))
+                        if signature[0] is None or tasks is None:
+                            continue
+                        days[date_str] = format_status_lines(tasks)
+                        packed[name] = signature
+                    write_pack(self._path(pack_name(month)), days)
+                    self.index.add(pack_name(month))
+                    self.tracker.note(self._path(pack_name(month)))
+
+                    for name, signature in packed.items():
+                        if self._file_signature(name) != signature:
+                            continue
+                        # The journal goes last: without its file it is never read
+                        WRITER.remove(self._path(name))
+                        WRITER.remove(self._journal(name).path)
+                        self.index.discard(name)
+                        self.tracker.note(self._path(name))
+                        self.tracker.note(self._journal(name).path)
+                        archived += 1
+        return archived
+
+    def _file_signature(self, name):
+        """(inode, mtime_ns, size) of a list file and of its journal, None if missing.
+
+        Every rewrite renames a new file into place, so the inode tells
+        rewrites apart even where timestamps are coarse.
+        """
+        try:
+            stat = os.stat(self._path(name))
+            file_signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            file_signature = None
+        return file_signature, self._journal(name).signature()
+
+    def _read_custom_file(self):
+        return self._read_list_file(
+            "custom_tasks.txt",
+            lambda content: [(text, False) for text in parse_custom_tasks(content)],
+        )
+
+    def read_custom_tasks(self):
+        tasks = self._read_list("custom_tasks.txt", self._read_custom_file)
+        return [text for text, _ in tasks] if tasks is not None else None
+
+    def write_custom_tasks(self, tasks, base=None):
+        if base is not None:
+            base = [(text, False) for text in base]
+        stored = self._write_list("custom_tasks.txt", [(text, False) for text in tasks],
+                                  self._read_custom_file, format_custom_tasks, base)
+        return [text for text, _ in stored]
+
+    def _read_progress_file(self):
+        return self._read_list_file("progress.txt", parse_task_file)
+
+    def read_progress(self):
+        return self._read_list("progress.txt", self._read_progress_file) or []
+
+    def write_progress(self, tasks, base=None):
+        return self._write_list("progress.txt", tasks, self._read_progress_file,
+                                format_status_lines, base)
+
+    def _read_learning_file(self):
+        return self._read_list_file(
+            "learning_tasks.txt",
+            lambda content: parse_status_lines(content.splitlines(), lenient=True),
+        )
+
+    def read_learning(self):
+        return self._read_list("learning_tasks.txt", self._read_learning_file)
+
+    def write_learning(self, tasks, base=None):
+        return self._write_list("learning_tasks.txt", tasks, self._read_learning_file,
+                                format_status_lines, base)
+
+    def read_daily(self, date_str):
+        return self._read_text(f"daily_{date_str}.txt")
+
+    def write_daily(self, date_str, content):
+        self._write_text(f"daily_{date_str}.txt", content)
+        self._run_save_hooks("daily", date_str, content)
+
+    def list_daily(self, limit=None):
+        return self._list_keys("daily", DATE_RE, limit)
+
+    def read_weekly(self, week_id):
+        return self._read_text(f"weekly_{week_id}.txt")
+
+    def write_weekly(self, week_id, content):
+        self._write_text(f"weekly_{week_id}.txt", content)
+        self._run_save_hooks("weekly", week_id, content)
+
+    def list_weekly(self, limit=None):
+        return self._list_keys("weekly", WEEK_ID_RE, limit)
+
+    @contextlib.contextmanager
+    def group_commit(self):
+        """Hold the data lock for the whole action and sync its writes together.
+
+        Writes queued for write-behind during the action are flushed at its
+        end, in the same group and under the same lock, so the action is
+        durable as a whole and other processes never see half of it.
+        """
+        with self.lock, WRITER.group():
+            yield
+            if self.write_queue is not None:
+                self.write_queue.flush()
+
+    def flush(self):
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    def close(self):
+        if self.write_queue is not None:
+            self.write_queue.close()
+        super().close()
+        try:
+            # Past days' todo entries are only worth keeping while in use
+            self.snapshot.save(keep_untouched=lambda name: not name.startswith("todo_"))
+        except OSError as e:
+            print(f"Error saving startup snapshot: {e}")
+        self.lock.close()
+
+
+def open_storage(data_dir, backend=None, write_behind=False):
+    """Open the storage backend for a data directory.
+
+    ``backend`` is "files" or "sqlite" and defaults to the TASKMANAGER_STORAGE
+    environment variable. The first time the SQLite backend is opened on a
+    directory it imports the existing text files. ``write_behind`` only
+    applies to the file backend; SQLite commits are already cheap.
+    """
+    backend = backend or os.environ.get("TASKMANAGER_STORAGE", "files")
+    if backend == "files":
+        return FileStorage(data_dir, write_behind=write_behind)
+    if backend == "sqlite":
+        from .sqlite_storage import SQLiteStorage, migrate_files_to_sqlite
+
+        db_path = os.path.join(data_dir, "task_data.db")
+        if not os.path.exists(db_path):
+            migrate_files_to_sqlite(data_dir, db_path)
+        return SQLiteStorage(db_path)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,75 @@
+"""Parse pasted lists and text/CSV files into tasks for bulk import."""
+import csv
+import io
+import re
+
+# "- ", "* ", "+ ", "1. " or "1) " list markers, then an optional [ ]/[x] box
+BULLET_RE = re.compile(r"^(?:[-*+]|\d+[.)])\s+")
+CHECKBOX_RE = re.compile(r"^\[([ xX])\]\s*")
+TRUE_VALUES = {"1", "x", "true", "yes", "y", "done"}
+HEADER_NAMES = {"task", "tasks", "text", "name", "title"}
+
+
+def parse_task_line(line):
+    """Return (text, done) for one line of a pasted list, or None if blank.
+
+    Understands ``status|text`` lines as written to the todo files, bullet
+    and numbered lists, and Markdown ``[ ]``/``[x]`` checkboxes.
+    """
+    line = line.strip()
+    done = False
+
+    status, sep, rest = line.partition("|")
+    if sep and status in ("0", "1"):
+        return (rest.strip(), status == "1") if rest.strip() else None
+
+    line = BULLET_RE.sub("", line)
+    match = CHECKBOX_RE.match(line)
+    if match:
+        done = match.group(1) != " "
+        line = line[match.end():]
+    line = line.strip()
+    return (line, done) if line else None
+
+
+def parse_task_text(text):
+    """Parse a pasted list, one task per line"""
+    tasks = []
+    for line in text.splitlines():
+        task = parse_task_line(line)
+        if task is not None:
+            tasks.append(task)
+    return tasks
+
+
+def parse_task_csv(text):
+    """Parse CSV rows of ``task[,done]``; a header row is skipped"""
+    tasks = []
+    for i, row in enumerate(csv.reader(io.StringIO(text))):
+        if not row or not row[0].strip():
+            continue
+        if i == 0 and row[0].strip().lower() in HEADER_NAMES:
+            continue
+        done = len(row) > 1 and row[1].strip().lower() in TRUE_VALUES
+        tasks.append((row[0].strip(), done))
+    return tasks
+
+
+def read_task_file(path):
+    """Parse a .csv file as CSV and anything else as a line list"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    if path.lower().endswith(".csv"):
+        return parse_task_csv(text)
+    return parse_task_text(text)
+
+
+def merge_tasks(existing, new):
+    """Return the tasks from ``new`` whose text is not already present"""
+    seen = set(existing)
+    merged = []
+    for text, done in new:
+        if text not in seen:
+            seen.add(text)
+            merged.append((text, done))
+    return merged
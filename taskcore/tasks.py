@@ -0,0 +1,109 @@
+"""Task-list rules shared by the GUI and the command line."""
+import datetime
+
+from .journal import merge_lists
+
+DEFAULT_TASKS = [
+    "Review daily goals",
+    "Complete priority tasks",
+    "Learning session",
+    "Exercise",
+    "Plan next day",
+]
+DEFAULT_LEARNING_TASKS = ["Python Programming", "Data Structures", "Algorithms"]
+WEEKLY_TASKS = [f"Week {i + 1}" for i in range(13)]
+
+
+def initialize_defaults(storage):
+    """Store the default task lists if they were never saved.
+
+    Returns the names of the lists that were created.
+    """
+    created = []
+    if storage.read_custom_tasks() is None:
+        storage.write_custom_tasks(DEFAULT_TASKS)
+        created.append("custom tasks")
+    if storage.read_learning() is None:
+        storage.write_learning([(task, False) for task in DEFAULT_LEARNING_TASKS])
+        created.append("learning tasks")
+    return created
+
+
+def read_day_tasks(storage, date_str):
+    """Return a day's tasks and whether they still have to be saved.
+
+    A day without a list starts from the custom tasks (or the defaults),
+    all unchecked.
+    """
+    todo = storage.read_todo(date_str)
+    if todo is not None:
+        return todo, False
+
+    tasks = storage.read_custom_tasks() or DEFAULT_TASKS
+    return [(task, False) for task in tasks], True
+
+
+def save_day_tasks(storage, date_str, tasks, analytics=None, base=None):
+    """Save a day's list, its score and the list as the custom tasks.
+
+    With ``analytics`` the streak and per-task aggregates are updated too.
+    The three files are made durable together with one group commit, which
+    also keeps other processes out until all of them are written. ``base``
+    is the list as it was loaded; edits saved by others since are merged.
+    Returns the list stored.
+    """
+    with storage.group_commit():
+        previous = storage.read_todo(date_str) if analytics is not None else None
+        tasks = storage.write_todo(date_str, tasks, base=base)
+        score = sum(1 for _, done in tasks if done)
+        storage.scores.upsert(date_str, score)
+        storage.write_custom_tasks([text for text, _ in tasks])
+        if analytics is not None:
+            analytics.record_day(date_str, previous, tasks)
+            analytics.record_score(date_str, score)
+    return tasks
+
+
+def rebase_edits(base, edited, stored):
+    """The list to show when ``stored`` is reloaded under unsaved edits.
+
+    ``edited`` is what is on screen, changed from ``base`` but not saved.
+    If there are no such changes the stored list is shown as it is;
+    otherwise the unsaved edits are merged into it.
+    """
+    if base is None or edited == base:
+        return stored
+    return merge_lists(base, edited, stored)
+
+
+def save_weekly_progress(storage, tasks, today=None, base=None):
+    """Save the weekly checkboxes and score them under the current ISO week.
+
+    Returns the checkboxes stored, merged with other processes' edits since ``base``.
+    """
+    year, week, _ = (today or datetime.date.today()).isocalendar()
+    with storage.group_commit():
+        tasks = storage.write_progress(tasks, base=base)
+        storage.scores.upsert(f"{year}-W{week:02d}", sum(1 for _, done in tasks if done))
+    return tasks
+
+
+def validate_log_date(date_str, today=None):
+    """Return an error message for a daily log date, or None if it is valid"""
+    try:
+        date = datetime.date.fromisoformat(date_str)
+    except ValueError:
+        return "Please use YYYY-MM-DD format"
+    if len(date_str) != 10:
+        return "Please use YYYY-MM-DD format"
+    if date > (today or datetime.date.today()):
+        return "Date cannot be in the future"
+    return None
+
+
+def review_week_id(week_num, year):
+    """Return the week id for a weekly review, or raise ValueError"""
+    week_num = int(week_num)
+    if not 1 <= week_num <= 52:
+        raise ValueError("Week number must be between 1-52")
+    return f"{year}-W{week_num:02d}"
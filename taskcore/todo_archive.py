@@ -0,0 +1,122 @@
+"""Monthly packs of closed-out todo_<date>.txt files.
+
+A pack holds one month of days in a single file, ``todo_<YYYY-MM>.pack``:
+
+    MAGIC | zlib dictionary | one zlib blob per day | JSON index | trailer
+
+Every day is compressed on its own against a dictionary built from the
+month's task texts, so the pack stays small while any day can be read
+with one seek and one read. The JSON index maps each date to the offset
+and length of its blob. The 12-byte trailer gives the index's offset and
+length.
+"""
+import io
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+
+from .persistence import WRITER
+
+MAGIC = b"TODOPACK1\n"
+TRAILER = struct.Struct(">QI")  # index offset, index length
+PACK_RE = re.compile(r"^todo_(\d{4}-\d{2})\.pack$")
+
+
+def pack_name(month):
+    return f"todo_{month}.pack"
+
+
+def build_dictionary(contents):
+    """The month's distinct lines, most frequent last (zlib favours the end)"""
+    counts = {}
+    for content in contents:
+        for line in content.splitlines(keepends=True):
+            counts[line] = counts.get(line, 0) + 1
+    lines = sorted(counts, key=counts.get)
+    return "".join(lines).encode("utf-8")[-32768:]
+
+
+def write_pack(path, days):
+    """Write a pack from {date: content}; replaces ``path`` atomically"""
+    zdict = build_dictionary(days.values())
+    index = {"version": 1, "days": {}}
+    with io.BytesIO() as f:
+        f.write(MAGIC)
+        index["dict"] = [f.tell(), len(zdict)]
+        f.write(zdict)
+        for date_str in sorted(days):
+            compressor = zlib.compressobj(9, zdict=zdict) if zdict else zlib.compressobj(9)
+            blob = compressor.compress(days[date_str].encode("utf-8")) + compressor.flush()
+            index["days"][date_str] = [f.tell(), len(blob)]
+            f.write(blob)
+        index_offset = f.tell()
+        index_data = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        f.write(index_data)
+        f.write(TRAILER.pack(index_offset, len(index_data)))
+        # Durable before the caller removes the files it replaces
+        WRITER.replace(path, f.getvalue())
+
+
+class TodoPack:
+    """Read access to one pack; the index and dictionary are read once"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a todo pack")
+            f.seek(-TRAILER.size, os.SEEK_END)
+            index_offset, index_length = TRAILER.unpack(f.read(TRAILER.size))
+            f.seek(index_offset)
+            index = json.loads(f.read(index_length))
+            dict_offset, dict_length = index["dict"]
+            f.seek(dict_offset)
+            self.zdict = f.read(dict_length)
+        self.days = {date_str: tuple(span) for date_str, span in index["days"].items()}
+
+    def read(self, date_str):
+        """Return one day's file content, or None if the pack lacks that day"""
+        span = self.days.get(date_str)
+        if span is None:
+            return None
+        offset, length = span
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            blob = f.read(length)
+        decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+        return (decompressor.decompress(blob) + decompressor.flush()).decode("utf-8")
+
+    def read_all(self):
+        return {date_str: self.read(date_str) for date_str in self.days}
+
+
+class PackCache:
+    """Open packs by month, reopened when the file on disk changes.
+
+    ``path_of`` maps a pack's file name to its path.
+    """
+
+    def __init__(self, path_of):
+        self.path_of = path_of
+        self._lock = threading.Lock()
+        self._packs = {}  # month -> (mtime_ns, size, TodoPack)
+
+    def get(self, month):
+        path = self.path_of(pack_name(month))
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._packs.pop(month, None)
+            return None
+        with self._lock:
+            cached = self._packs.get(month)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
+        pack = TodoPack(path)
+        with self._lock:
+            self._packs[month] = (stat.st_mtime_ns, stat.st_size, pack)
+        return pack
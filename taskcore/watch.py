@@ -0,0 +1,140 @@
+"""Tell which data files were changed by another program.
+
+A file system watcher only reports that something in a directory changed.
+ChangeTracker remembers the (mtime_ns, size) of every file in the data
+directories and turns such a report into the names that were added,
+removed or modified. Files written by this process are recorded with
+note() as they are saved, so they never show up as outside changes.
+"""
+import os
+import threading
+
+from .layout import MONTH_RE, YEAR_RE
+
+
+def classify(name):
+    """Map a data file name to what has to be reloaded: (kind, key) or None"""
+    stem, ext = os.path.splitext(name)
+    prefix, _, key = stem.partition("_")
+    if ext == ".tmp":
+        return None
+    if prefix == "todo" and ext in (".txt", ".journal"):
+        return "todo", key
+    if prefix == "todo" and ext == ".pack":
+        return "archive", key
+    if prefix in ("daily", "weekly") and ext == ".txt":
+        return prefix, key
+    if stem in ("custom_tasks", "progress", "learning_tasks") and ext in (".txt", ".journal"):
+        return "list", stem
+    if name == "goal_date.txt":
+        return "goal", None
+    if name == "task_score.csv":
+        return "scores", None
+    return None
+
+
+class ChangeTracker:
+    """Last known signature of every file in the watched directories"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._seen = None  # directory -> {name: (mtime_ns, size)}
+
+    @staticmethod
+    def _list(directory):
+        files, subdirs = {}, []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        subdirs.append(entry)
+                    else:
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return files, subdirs
+
+    def directories(self):
+        """Return every data directory and the ones that are new since the last call.
+
+        On the first call the files found are the baseline. A directory
+        that appears later starts out empty, so everything in it is
+        reported by the next scan().
+        """
+        with self._lock:
+            first = self._seen is None
+            if first:
+                self._seen = {}
+        found, new = [], []
+        pending = [(self.data_dir, YEAR_RE)]
+        while pending:
+            directory, subdir_re = pending.pop()
+            files, subdirs = self._list(directory)
+            found.append(directory)
+            with self._lock:
+                if directory not in self._seen:
+                    self._seen[directory] = files if first else {}
+                    if not first:
+                        new.append(directory)
+            if subdir_re is not None:
+                pending.extend((entry.path, MONTH_RE if subdir_re is YEAR_RE else None)
+                               for entry in subdirs if subdir_re.match(entry.name))
+        return found, new
+
+    def appended_files(self):
+        """Files that change in place (journals, the score log), which a
+        directory watch does not report"""
+        with self._lock:
+            return [
+                os.path.join(directory, name)
+                for directory, files in (self._seen or {}).items()
+                for name in files
+                if name.endswith(".journal") or name == "task_score.csv"
+            ]
+
+    def scan(self, path):
+        """Return the names under ``path`` (a directory or one file) that changed"""
+        with self._lock:
+            known_dir = self._seen is not None and path in self._seen
+        if known_dir or os.path.isdir(path):
+            # A removed directory lists as empty, so all its files are reported
+            directory, (current, _) = path, self._list(path)
+            only = None
+        else:
+            directory, only = os.path.dirname(path), os.path.basename(path)
+            try:
+                stat = os.stat(path)
+                current = {only: (stat.st_mtime_ns, stat.st_size)}
+            except FileNotFoundError:
+                current = {}
+        with self._lock:
+            if self._seen is None:
+                return []
+            seen = self._seen.setdefault(directory, {})
+            names = [only] if only is not None else set(seen) | set(current)
+            changed = []
+            for name in names:
+                if seen.get(name) != current.get(name):
+                    changed.append(name)
+                    if name in current:
+                        seen[name] = current[name]
+                    else:
+                        seen.pop(name, None)
+            if only is None and not current and not os.path.isdir(directory):
+                del self._seen[directory]
+            return changed
+
+    def note(self, path):
+        """Record a file this process just wrote or removed"""
+        with self._lock:
+            if self._seen is None:
+                return
+            seen = self._seen.setdefault(os.path.dirname(path), {})
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                seen.pop(os.path.basename(path), None)
+                return
+            seen[os.path.basename(path)] = (stat.st_mtime_ns, stat.st_size)